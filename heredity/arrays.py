@@ -0,0 +1,24 @@
+"""
+The heredity model's probabilities as NumPy arrays, indexed by gene count
+"""
+
+import numpy as np
+
+from heredity import GENES, PROBS, inherit_probability
+
+# Probability of each gene count with no parents known
+PRIOR = np.array([PROBS["gene"][genes] for genes in GENES])
+
+# Probability of the trait, indexed by gene count and whether it is present
+TRAIT = np.array([[PROBS["trait"][genes][False], PROBS["trait"][genes][True]]
+                  for genes in GENES])
+
+# Probability of the evidence, indexed by gene count and whether the trait
+# is absent, present or unknown
+EVIDENCE = np.column_stack([TRAIT, np.ones(len(GENES))])
+
+# Probability of a child's gene count, indexed by child, mother and father
+INHERIT = np.array([[[inherit_probability(genes, mother, father)
+                      for father in GENES]
+                     for mother in GENES]
+                    for genes in GENES])
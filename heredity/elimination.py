@@ -0,0 +1,230 @@
+"""
+Exact inference for heredity by variable elimination
+
+Usage: python elimination.py data.csv
+"""
+
+import heapq
+import itertools
+import sys
+
+from heredity import (
+    GENES, PROBS, distributions, inherit_probability, load_data,
+    print_probabilities
+)
+
+
+class Factor():
+    """
+    Function from the gene counts of some people to a non-negative number.
+    `table` maps each tuple of gene counts, in the order of `variables`,
+    to its value.
+    """
+
+    def __init__(self, variables, table):
+        self.variables = tuple(variables)
+        self.table = table
+
+
+def main():
+    # Check for proper usage
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python elimination.py data.csv")
+    people = load_data(sys.argv[1])
+    print_probabilities(people, infer(people))
+
+
+def factors(people):
+    """
+    Return the factors of the heredity model for `people`, as returned by
+    `load_data`: each person's gene prior, or the probability of their
+    gene count given their parents', and, for people whose trait is known,
+    the probability of that trait given their gene count.
+    """
+    result = []
+    for name, person in people.items():
+        mother, father = person["mother"], person["father"]
+        if mother is None:
+            result.append(Factor(
+                (name,), {(genes,): PROBS["gene"][genes] for genes in GENES}
+            ))
+        else:
+            result.append(Factor((mother, father, name), {
+                (m, f, genes): inherit_probability(genes, m, f)
+                for m, f, genes in itertools.product(GENES, repeat=3)
+            }))
+        if person["trait"] is not None:
+            result.append(Factor((name,), {
+                (genes,): PROBS["trait"][genes][person["trait"]]
+                for genes in GENES
+            }))
+    return result
+
+
+def product(factors):
+    """
+    Return the product of factors, over the union of their variables.
+    """
+    variables = tuple(dict.fromkeys(
+        variable for factor in factors for variable in factor.variables
+    ))
+    positions = [
+        [variables.index(variable) for variable in factor.variables]
+        for factor in factors
+    ]
+    table = dict()
+    for values in itertools.product(GENES, repeat=len(variables)):
+        p = 1
+        for factor, indices in zip(factors, positions):
+            p *= factor.table[tuple(values[i] for i in indices)]
+            if not p:
+                break
+        table[values] = p
+    return Factor(variables, table)
+
+
+def sum_out(factor, variable):
+    """
+    Return the factor summed over every value of `variable`.
+    """
+    i = factor.variables.index(variable)
+    table = dict()
+    for values, p in factor.table.items():
+        key = values[:i] + values[i + 1:]
+        table[key] = table.get(key, 0) + p
+    return Factor(factor.variables[:i] + factor.variables[i + 1:], table)
+
+
+def elimination_order(factors):
+    """
+    Return an order in which to eliminate every variable, chosen greedily
+    to add the fewest edges between the remaining variables (min-fill).
+    On a pedigree without loops this eliminates people from the leaves
+    inwards, so no factor grows beyond a person and their parents.
+    """
+    neighbors = dict()
+    for factor in factors:
+        for variable in factor.variables:
+            neighbors.setdefault(variable, set()).update(factor.variables)
+    for variable in neighbors:
+        neighbors[variable].discard(variable)
+
+    def fill(variable):
+        adjacent = list(neighbors[variable])
+        return sum(
+            1 for a, b in itertools.combinations(adjacent, 2)
+            if b not in neighbors[a]
+        )
+
+    # Scores only change near an eliminated variable, so keep them in a
+    # heap and skip entries made stale since they were pushed
+    rank = {variable: i for i, variable in enumerate(neighbors)}
+    scores = dict()
+    heap = []
+
+    def push(variable):
+        scores[variable] = (fill(variable), len(neighbors[variable]),
+                            rank[variable])
+        heapq.heappush(heap, (scores[variable], variable))
+
+    for variable in neighbors:
+        push(variable)
+
+    order = []
+    while heap:
+        score, variable = heapq.heappop(heap)
+        if variable not in neighbors or scores[variable] != score:
+            continue
+        adjacent = neighbors.pop(variable)
+        for a in adjacent:
+            neighbors[a].discard(variable)
+            neighbors[a].update(adjacent - {a})
+        order.append(variable)
+        for a in set(adjacent).union(*(neighbors[a] for a in adjacent)):
+            push(a)
+    return order
+
+
+def marginalize(factor, keep):
+    """
+    Return the factor summed over every variable not in `keep`.
+    """
+    for variable in factor.variables:
+        if variable not in keep:
+            factor = sum_out(factor, variable)
+    return factor
+
+
+def rescale(factor):
+    """
+    Return the factor scaled to sum to 1, so that products of many
+    messages do not underflow. Scaling a message does not change the
+    distributions calibrated from it once they are normalized.
+    """
+    total = sum(factor.table.values())
+    return Factor(factor.variables, {
+        values: p / total for values, p in factor.table.items()
+    })
+
+
+def calibrate(factors, order):
+    """
+    Return the unnormalized distribution of every variable's gene count.
+
+    Eliminating the variables in `order` sends each one's summed-out
+    product as a message to the next variable in it to be eliminated.
+    Passing messages back down that tree then gives every variable the
+    product of all factors at once, instead of one elimination per person.
+    """
+    position = {variable: i for i, variable in enumerate(order)}
+
+    # Each factor belongs to the first of its variables to be eliminated
+    assigned = {variable: [] for variable in order}
+    for factor in factors:
+        assigned[min(factor.variables, key=position.get)].append(factor)
+
+    # Upward pass: eliminate each variable into its message to its parent
+    upward = dict()
+    children = {variable: [] for variable in order}
+    for variable in order:
+        incoming = assigned[variable] + [
+            upward[child] for child in children[variable]
+        ]
+        upward[variable] = rescale(sum_out(product(incoming), variable))
+        if upward[variable].variables:
+            parent = min(upward[variable].variables, key=position.get)
+            children[parent].append(variable)
+
+    # Downward pass: send each child everything except its own message
+    downward = dict()
+    distributions = dict()
+    for variable in reversed(order):
+        incoming = assigned[variable] + [
+            upward[child] for child in children[variable]
+        ]
+        if variable in downward:
+            incoming.append(downward[variable])
+        result = marginalize(product(incoming), (variable,))
+        distributions[variable] = {
+            genes: result.table[(genes,)] for genes in GENES
+        }
+        for child in children[variable]:
+            others = [factor for factor in incoming
+                      if factor is not upward[child]]
+            downward[child] = rescale(marginalize(
+                product(others), upward[child].variables
+            ))
+    return distributions
+
+
+def infer(people):
+    """
+    Return every person's gene and trait distributions given the known
+    traits, from one calibration of the model's factors.
+    """
+    model = factors(people)
+    return distributions(people, calibrate(model, elimination_order(model)))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,9 @@ PROBS = {
     "mutation": 0.01,
 }
 
+# Values a person's number of copies of the gene can take
+GENES = (0, 1, 2)
+
 
 def main():
     # Check for proper usage
@@ -55,6 +58,13 @@ def main():
     normalize(probabilities)
 
     # Print results
+    print_probabilities(people, probabilities)
+
+
+def print_probabilities(people, probabilities):
+    """
+    Print the gene and trait distributions of every person.
+    """
     for person in people:
         print(f"{person}: ")
         for field in probabilities[person]:
@@ -104,6 +114,78 @@ def powerset(s):
     ]
 
 
+def topological_order(people):
+    """
+    Return the names of `people` ordered so that everyone comes after
+    their parents.
+    """
+    order = []
+    visited = set()
+
+    def visit(name):
+        if name in visited:
+            return
+        visited.add(name)
+        for parent in (people[name]["mother"], people[name]["father"]):
+            if parent is not None:
+                visit(parent)
+        order.append(name)
+
+    for name in people:
+        visit(name)
+    return order
+
+
+def pass_probability(genes):
+    """
+    Return the probability that a parent with `genes` copies of the gene
+    passes one on to a child.
+    """
+    if genes == 2:
+        return 1 - PROBS["mutation"]
+    if genes == 1:
+        return 0.5
+    return PROBS["mutation"]
+
+
+def inherit_probability(genes, mother_genes, father_genes):
+    """
+    Return the probability that a child has `genes` copies of the gene,
+    given how many copies each parent has.
+    """
+    mother = pass_probability(mother_genes)
+    father = pass_probability(father_genes)
+    if genes == 2:
+        return mother * father
+    if genes == 1:
+        return mother * (1 - father) + father * (1 - mother)
+    return (1 - mother) * (1 - father)
+
+
+def distributions(people, genes):
+    """
+    Return the gene and trait distributions of every person, in the
+    structure `main` builds, given `genes`, which maps each person to
+    unnormalized weights indexed by their number of copies of the gene.
+    Known traits are certain; others follow from the gene distribution.
+    """
+    probabilities = dict()
+    for person in people:
+        total = sum(genes[person][value] for value in GENES)
+        gene = {
+            value: float(genes[person][value] / total) for value in (2, 1, 0)
+        }
+        trait = people[person]["trait"]
+        if trait is None:
+            present = sum(gene[value] * PROBS["trait"][value][True]
+                          for value in GENES)
+            trait = {True: present, False: 1 - present}
+        else:
+            trait = {True: float(trait), False: float(not trait)}
+        probabilities[person] = {"gene": gene, "trait": trait}
+    return probabilities
+
+
 def joint_probability(people, one_gene, two_genes, have_trait):
     """
     Compute and return a joint probability.
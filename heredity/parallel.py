@@ -0,0 +1,158 @@
+"""
+Exact enumeration for heredity, sharded across a process pool
+
+Usage: python parallel.py data.csv [processes]
+"""
+
+import multiprocessing
+import os
+import sys
+
+from heredity import (
+    PROBS, inherit_probability, load_data, normalize, print_probabilities
+)
+
+# Shards of the assignments to give each process, so that uneven shards
+# still balance across the pool
+SHARDS_PER_PROCESS = 8
+
+
+def main():
+    # Check for proper usage
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python parallel.py data.csv [processes]")
+    people = load_data(sys.argv[1])
+    processes = int(sys.argv[2]) if len(sys.argv) == 3 else None
+    print_probabilities(people, infer(people, processes))
+
+
+def submasks(mask):
+    """
+    Yield every subset of the bits set in `mask`, from `mask` down to 0.
+    """
+    subset = mask
+    while True:
+        yield subset
+        if not subset:
+            return
+        subset = (subset - 1) & mask
+
+
+def trait_masks(people, names):
+    """
+    Yield, as bit masks over `names`, every set of people who might have
+    the trait without contradicting the known traits.
+    """
+    known = 0
+    present = 0
+    for i, name in enumerate(names):
+        if people[name]["trait"] is not None:
+            known |= 1 << i
+            present |= people[name]["trait"] << i
+    for unknown in submasks(~known & ((1 << len(names)) - 1)):
+        yield present | unknown
+
+
+def enumerate_shard(task):
+    """
+    Return the unnormalized gene and trait tables of each person, summed
+    over the assignments of one shard: one set of people with the trait,
+    and the sets of people with one copy of the gene numbered `start` to
+    `stop`, each with every set of the others having two copies.
+    """
+    parents, have_trait, start, stop = task
+    n = len(parents)
+    genes_total = [[0, 0, 0] for _ in range(n)]
+    trait_total = [[0, 0] for _ in range(n)]
+    everyone = (1 << n) - 1
+
+    # Probability of each gene count with no parents known, of a child's
+    # given their mother's and father's, and of each person's trait
+    priors = [PROBS["gene"][genes] for genes in range(3)]
+    inherit = [[[inherit_probability(genes, mother, father)
+                 for father in range(3)]
+                for mother in range(3)]
+               for genes in range(3)]
+    trait_chances = [
+        [PROBS["trait"][genes][bool(have_trait >> i & 1)]
+         for genes in range(3)]
+        for i in range(n)
+    ]
+
+    for one_gene in range(start, stop):
+        for two_genes in submasks(everyone & ~one_gene):
+            genes = [
+                2 if two_genes >> i & 1 else one_gene >> i & 1
+                for i in range(n)
+            ]
+
+            # Joint probability, as in heredity.joint_probability
+            p = 1
+            for i, (mother, father) in enumerate(parents):
+                if mother is None:
+                    p *= priors[genes[i]] * trait_chances[i][genes[i]]
+                else:
+                    p *= (inherit[genes[i]][genes[mother]][genes[father]]
+                          * trait_chances[i][genes[i]])
+
+            # Update, as in heredity.update
+            for i in range(n):
+                genes_total[i][genes[i]] += p
+                trait_total[i][have_trait >> i & 1] += p
+    return genes_total, trait_total
+
+
+def shards(people, names, count):
+    """
+    Yield the tasks for `enumerate_shard`, splitting the sets of people
+    with one copy of the gene into about `count` shards across every
+    possible set of people with the trait.
+    """
+    index = {name: i for i, name in enumerate(names)}
+    parents = tuple(
+        (index.get(people[name]["mother"]), index.get(people[name]["father"]))
+        for name in names
+    )
+    traits = list(trait_masks(people, names))
+    masks = 1 << len(names)
+    step = max(1, -(-masks * len(traits) // count))
+    for have_trait in traits:
+        for start in range(0, masks, step):
+            yield parents, have_trait, start, min(start + step, masks)
+
+
+def infer(people, processes=None):
+    """
+    Return every person's gene and trait distributions given the known
+    traits, summing the joint probabilities of the assignments in shards
+    across `processes` processes, or one per CPU.
+    """
+    names = list(people)
+    processes = processes or os.cpu_count() or 1
+
+    # Keep track of gene and trait probabilities for each person
+    probabilities = {
+        person: {"gene": {2: 0, 1: 0, 0: 0}, "trait": {True: 0, False: 0}}
+        for person in people
+    }
+
+    # Merge the tables of every shard as they finish
+    tasks = shards(people, names, processes * SHARDS_PER_PROCESS)
+    with multiprocessing.Pool(processes) as pool:
+        for genes_total, trait_total in pool.imap_unordered(
+            enumerate_shard, tasks
+        ):
+            for i, person in enumerate(names):
+                distributions = probabilities[person]
+                for genes in (2, 1, 0):
+                    distributions["gene"][genes] += genes_total[i][genes]
+                for trait in (True, False):
+                    distributions["trait"][trait] += trait_total[i][trait]
+
+    # Ensure probabilities sum to 1
+    normalize(probabilities)
+    return probabilities
+
+
+if __name__ == "__main__":
+    main()
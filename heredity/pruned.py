@@ -0,0 +1,104 @@
+"""
+Exact or approximate enumeration for heredity, pruning unlikely branches
+
+Usage: python pruned.py data.csv [cutoff]
+"""
+
+import sys
+
+from heredity import (
+    GENES, PROBS, inherit_probability, load_data, normalize,
+    print_probabilities, topological_order
+)
+
+
+def main():
+    # Check for proper usage
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python pruned.py data.csv [cutoff]")
+    people = load_data(sys.argv[1])
+    cutoff = float(sys.argv[2]) if len(sys.argv) == 3 else 0
+    try:
+        probabilities = infer(people, cutoff)
+    except ValueError as error:
+        sys.exit(str(error))
+    print_probabilities(people, probabilities)
+
+
+def infer(people, cutoff=0):
+    """
+    Return every person's gene and trait distributions given the known
+    traits, normalized as `heredity.main` does.
+
+    People are assigned a gene count and trait one at a time, parents
+    first, multiplying the joint probability by each person's factors as
+    they are assigned. Known traits are the only value tried for their
+    person. Since every factor is at most 1, a partial probability that
+    is 0 or below `cutoff` bounds every assignment completing it, so the
+    branch is skipped. A cutoff above 0 drops those assignments from the
+    result, trading accuracy for time.
+    """
+    order = topological_order(people)
+    position = {name: i for i, name in enumerate(order)}
+    n = len(order)
+
+    # Positions of each person's parents, and the trait values to try
+    parents = [
+        (position.get(people[name]["mother"]),
+         position.get(people[name]["father"]))
+        for name in order
+    ]
+    traits = [
+        (True, False) if people[name]["trait"] is None
+        else (people[name]["trait"],)
+        for name in order
+    ]
+
+    genes = [0] * n
+    have_trait = [False] * n
+    genes_total = [{2: 0, 1: 0, 0: 0} for _ in range(n)]
+    trait_total = [{True: 0, False: 0} for _ in range(n)]
+
+    def assign(i, p):
+        # Every person is assigned, so update with the joint probability
+        if i == n:
+            for j in range(n):
+                genes_total[j][genes[j]] += p
+                trait_total[j][have_trait[j]] += p
+            return
+
+        mother, father = parents[i]
+        for count in GENES:
+            if mother is None:
+                q = p * PROBS["gene"][count]
+            else:
+                q = p * inherit_probability(
+                    count, genes[mother], genes[father]
+                )
+            if not q or q < cutoff:
+                continue
+            genes[i] = count
+            for trait in traits[i]:
+                r = q * PROBS["trait"][count][trait]
+                if not r or r < cutoff:
+                    continue
+                have_trait[i] = trait
+                assign(i + 1, r)
+
+    assign(0, 1)
+    if n and not sum(genes_total[0].values()):
+        raise ValueError(f"cutoff {cutoff} prunes every assignment")
+
+    probabilities = {
+        name: {"gene": genes_total[i], "trait": trait_total[i]}
+        for i, name in enumerate(order)
+    }
+    probabilities = {name: probabilities[name] for name in people}
+
+    # Ensure probabilities sum to 1
+    normalize(probabilities)
+    return probabilities
+
+
+if __name__ == "__main__":
+    main()
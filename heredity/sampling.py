@@ -0,0 +1,255 @@
+"""
+Approximate inference for heredity by likelihood weighting or Gibbs sampling
+
+Usage: python sampling.py data.csv [--method weighting|gibbs] [--ess N]
+                          [--seconds S] [--chains N] [--seed SEED]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from heredity import (
+    distributions, load_data, print_probabilities, topological_order
+)
+from arrays import EVIDENCE, INHERIT, PRIOR
+
+# Sampling methods, by name
+METHODS = ("weighting", "gibbs")
+
+# Samples drawn at once by likelihood weighting
+BATCH = 1024
+
+# Gibbs sweeps discarded at the start of each chain, and run between
+# checks for convergence
+BURN_IN = 100
+SWEEPS = 20
+
+# Largest potential scale reduction factor at which Gibbs chains are
+# taken to have converged
+RHAT = 1.01
+
+# Logarithms of the model's tables, so that products over hundreds of
+# people do not underflow
+LOG_PRIOR = np.log(PRIOR)
+LOG_EVIDENCE = np.log(EVIDENCE)
+LOG_INHERIT = np.log(INHERIT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("data")
+    parser.add_argument("--method", choices=METHODS, default="gibbs")
+    parser.add_argument("--ess", type=float, default=1000,
+                        help="effective sample size to stop at")
+    parser.add_argument("--seconds", type=float, default=10,
+                        help="time to stop at if the sample size is not met")
+    parser.add_argument("--chains", type=int, default=32,
+                        help="Gibbs chains run side by side")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    people = load_data(args.data)
+    if args.method == "weighting":
+        probabilities, diagnostics = likelihood_weighting(
+            people, args.ess, args.seconds, args.seed
+        )
+    else:
+        probabilities, diagnostics = gibbs(
+            people, args.ess, args.seconds, args.chains, args.seed
+        )
+    print_probabilities(people, probabilities)
+    print(", ".join(f"{key}: {value:.6g}"
+                    for key, value in diagnostics.items()))
+
+
+def pedigree(people):
+    """
+    Return the names of `people` with parents before children, the
+    positions in that order of each person's mother and father, or None
+    for people without parents, and each person's trait as an index into
+    the columns of `EVIDENCE`: 0 if absent, 1 if present, 2 if unknown.
+    """
+    order = topological_order(people)
+    position = {name: i for i, name in enumerate(order)}
+    mothers = [position.get(people[name]["mother"]) for name in order]
+    fathers = [position.get(people[name]["father"]) for name in order]
+    traits = [2 if people[name]["trait"] is None
+              else int(people[name]["trait"]) for name in order]
+    return order, mothers, fathers, traits
+
+
+def choose(rng, probabilities):
+    """
+    Return one gene count drawn for each row of `probabilities`.
+    """
+    cumulative = probabilities.cumsum(axis=1)
+    draws = rng.random(len(probabilities)) * cumulative[:, -1]
+    return (draws[:, None] >= cumulative[:, :-1]).sum(axis=1)
+
+
+def likelihood_weighting(people, ess=1000, seconds=10, seed=None):
+    """
+    Return estimates of every person's gene and trait distributions given
+    the known traits, and diagnostics of the sampling.
+
+    Batches of samples draw every person's gene count given their
+    parents', in order from the oldest, and are weighted by the
+    probability of the known traits given them. Sampling stops once the
+    weights' effective sample size reaches `ess`, or after `seconds`.
+    """
+    rng = np.random.default_rng(seed)
+    order, mothers, fathers, traits = pedigree(people)
+    n = len(order)
+    columns = 3 * np.arange(n)
+
+    # Weighted gene counts, and sums of the weights and their squares,
+    # all scaled by exp(-scale) to stay in range
+    totals = np.zeros(3 * n)
+    weights = 0
+    squares = 0
+    scale = -np.inf
+    samples = 0
+
+    start = time.perf_counter()
+    while True:
+        genes = np.empty((BATCH, n), dtype=np.int64)
+        log_weights = np.zeros(BATCH)
+        for i in range(n):
+            if mothers[i] is None:
+                probabilities = np.broadcast_to(PRIOR, (BATCH, 3))
+            else:
+                probabilities = INHERIT[:, genes[:, mothers[i]],
+                                        genes[:, fathers[i]]].T
+            genes[:, i] = choose(rng, probabilities)
+            log_weights += LOG_EVIDENCE[genes[:, i], traits[i]]
+
+        # Rescale the running sums if this batch has a larger weight
+        largest = log_weights.max()
+        if largest > scale:
+            totals *= np.exp(scale - largest)
+            weights *= np.exp(scale - largest)
+            squares *= np.exp(2 * (scale - largest))
+            scale = largest
+        batch = np.exp(log_weights - scale)
+        totals += np.bincount((columns + genes).ravel(), np.repeat(batch, n),
+                              minlength=3 * n)
+        weights += batch.sum()
+        squares += (batch ** 2).sum()
+        samples += BATCH
+
+        effective = weights ** 2 / squares
+        elapsed = time.perf_counter() - start
+        if effective >= ess or elapsed >= seconds:
+            break
+
+    diagnostics = {"samples": samples, "ess": effective, "seconds": elapsed}
+    genes = dict(zip(order, totals.reshape(n, 3)))
+    return distributions(people, genes), diagnostics
+
+
+def gibbs(people, ess=1000, seconds=10, chains=32, seed=None):
+    """
+    Return estimates of every person's gene and trait distributions given
+    the known traits, and diagnostics of the chains.
+
+    Each sweep redraws every person's gene count in every chain given the
+    rest: their parents', their children's and their children's other
+    parents', and their trait if known. Every draw's conditional
+    distribution is averaged, rather than the draw itself. Sampling stops
+    once the chains agree, with the largest potential scale reduction
+    factor (R-hat) below `RHAT` and the effective sample size estimated
+    from the chains' variances at least `ess`, or after `seconds`, though
+    never before `BURN_IN` sweeps and a couple more to compare.
+    """
+    if chains < 2:
+        raise ValueError("Gibbs sampling needs at least two chains")
+    rng = np.random.default_rng(seed)
+    order, mothers, fathers, traits = pedigree(people)
+    n = len(order)
+
+    # Each person's children, and whether they are their mother
+    children = [[] for _ in range(n)]
+    for child in range(n):
+        if mothers[child] is not None:
+            children[mothers[child]].append((child, True))
+            children[fathers[child]].append((child, False))
+
+    # Start every chain from a sample of the model without evidence
+    genes = np.empty((chains, n), dtype=np.int64)
+    for i in range(n):
+        if mothers[i] is None:
+            probabilities = np.broadcast_to(PRIOR, (chains, 3))
+        else:
+            probabilities = INHERIT[:, genes[:, mothers[i]],
+                                    genes[:, fathers[i]]].T
+        genes[:, i] = choose(rng, probabilities)
+
+    # Sums over sweeps of each chain's conditional distributions, and of
+    # their squares, after burn-in
+    totals = np.zeros((chains, n, 3))
+    squares = np.zeros((chains, n, 3))
+    sweeps = 0
+    rhat = effective = np.nan
+
+    start = time.perf_counter()
+    while True:
+        for _ in range(SWEEPS):
+            conditionals = np.empty((chains, n, 3))
+            for i in range(n):
+                if mothers[i] is None:
+                    log_p = np.broadcast_to(LOG_PRIOR, (chains, 3)).copy()
+                else:
+                    log_p = LOG_INHERIT[:, genes[:, mothers[i]],
+                                        genes[:, fathers[i]]].T.copy()
+                log_p += LOG_EVIDENCE[:, traits[i]]
+                for child, mother in children[i]:
+                    if mother:
+                        log_p += LOG_INHERIT[genes[:, child], :,
+                                             genes[:, fathers[child]]]
+                    else:
+                        log_p += LOG_INHERIT[genes[:, child],
+                                             genes[:, mothers[child]], :]
+                p = np.exp(log_p - log_p.max(axis=1, keepdims=True))
+                p /= p.sum(axis=1, keepdims=True)
+                conditionals[:, i] = p
+                genes[:, i] = choose(rng, p)
+            sweeps += 1
+            if sweeps > BURN_IN:
+                totals += conditionals
+                squares += conditionals ** 2
+
+        # Compare the variance within and between chains of the averages
+        if sweeps >= BURN_IN + 2:
+            kept = sweeps - BURN_IN
+            means = totals / kept
+            within = ((squares - kept * means ** 2) / (kept - 1)).mean(axis=0)
+            between = kept * means.var(axis=0, ddof=1)
+            pooled = (kept - 1) / kept * within + between / kept
+            varying = within > 1e-12
+            if varying.any():
+                rhat = np.sqrt(pooled[varying] / within[varying]).max()
+                effective = np.minimum(
+                    chains * kept,
+                    chains * kept * pooled[varying]
+                    / np.maximum(between[varying], 1e-300)
+                ).min()
+            else:
+                rhat, effective = 1.0, chains * kept
+        elapsed = time.perf_counter() - start
+        if sweeps <= BURN_IN + 1:
+            continue
+        if rhat <= RHAT and effective >= ess or elapsed >= seconds:
+            break
+
+    diagnostics = {
+        "samples": chains * (sweeps - BURN_IN), "ess": effective, "rhat": rhat,
+        "seconds": elapsed,
+    }
+    genes = dict(zip(order, totals.sum(axis=0)))
+    return distributions(people, genes), diagnostics
+
+
+if __name__ == "__main__":
+    main()
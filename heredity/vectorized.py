@@ -0,0 +1,105 @@
+"""
+Exact enumeration for heredity with batched NumPy operations
+
+Usage: python vectorized.py data.csv
+"""
+
+import functools
+import sys
+
+import numpy as np
+
+from heredity import GENES, distributions, load_data, print_probabilities
+from arrays import EVIDENCE, INHERIT, PRIOR
+
+# Gene assignments evaluated at once, to bound memory on larger families
+CHUNK = 1 << 14
+
+
+def main():
+    # Check for proper usage
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python vectorized.py data.csv")
+    people = load_data(sys.argv[1])
+    print_probabilities(people, infer(people))
+
+
+@functools.lru_cache(maxsize=4)
+def assignments(start, stop, n):
+    """
+    Return the gene counts of `n` people for assignments `start` to `stop`,
+    one row per assignment, reading each assignment's number in base 3,
+    and the same counts one-hot encoded, with three columns per person.
+
+    Both are cached and read-only, since they do not depend on who the
+    people are, and are floats so that products with them use BLAS.
+    """
+    codes = np.arange(start, stop, dtype=np.int64)
+    genes = (codes[:, None] // 3 ** np.arange(n)) % 3
+    onehot = genes[:, :, None] == np.arange(len(GENES))
+    onehot = onehot.reshape(len(codes), -1)
+    genes, onehot = genes.astype(np.float64), onehot.astype(np.float64)
+    genes.flags.writeable = onehot.flags.writeable = False
+    return genes, onehot
+
+
+def tables(people, names):
+    """
+    Return each person's factor of the joint probability as a table
+    indexed by their own gene count and their mother's and father's:
+    the inheritance probability, or the prior for people without
+    parents, times the probability of their trait if it is known.
+    """
+    founders = np.array([people[name]["mother"] is None for name in names])
+    traits = np.array([
+        2 if people[name]["trait"] is None else int(people[name]["trait"])
+        for name in names
+    ], dtype=np.int64)
+    result = np.where(founders[:, None, None, None],
+                      PRIOR[:, None, None], INHERIT)
+    return result * EVIDENCE[:, traits].T[:, :, None, None]
+
+
+def infer(people):
+    """
+    Return every person's gene and trait distributions given the known
+    traits.
+
+    Every gene assignment is enumerated, as `heredity.main` does, but a
+    chunk of them at a time as an array with a column per person, so
+    `joint_probability`, `update` and `normalize` become array operations.
+    Traits are summed out directly rather than enumerated: an unknown
+    trait contributes a factor that sums to 1 over its two values.
+    """
+    names = list(people)
+    n = len(names)
+    index = {name: i for i, name in enumerate(names)}
+
+    # Position of each assignment's factor for each person in the
+    # flattened tables, as a weighted sum of the gene counts of the person
+    # and their parents. People without parents index with their own
+    # column, as their tables do not depend on their parents.
+    weights = np.zeros((n, n))
+    for i, name in enumerate(names):
+        weights[i, i] += 9
+        weights[index.get(people[name]["mother"], i), i] += 3
+        weights[index.get(people[name]["father"], i), i] += 1
+    factors = tables(people, names).ravel()
+    offsets = 27 * np.arange(n)
+
+    genes_total = np.zeros(n * len(GENES))
+    for start in range(0, 3 ** n, CHUNK):
+        genes, onehot = assignments(start, min(start + CHUNK, 3 ** n), n)
+
+        # Joint probability of each assignment with the known traits
+        p = factors[(genes @ weights).astype(np.intp) + offsets].prod(axis=1)
+
+        # Add each assignment's probability to every person's gene count
+        genes_total += p @ onehot
+
+    genes_total = genes_total.reshape(n, len(GENES))
+    return distributions(people, dict(zip(names, genes_total)))
+
+
+if __name__ == "__main__":
+    main()
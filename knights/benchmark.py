@@ -0,0 +1,108 @@
+"""
+Benchmark of the entailment engines on generated knights and knaves puzzles
+
+Usage: python benchmark.py [--sizes N ...] [--seed SEED] [--engines NAME ...]
+"""
+
+import argparse
+import sys
+import time
+
+from generator import generate
+from logic import And, KnowledgeBase, Not, marginals, model_check
+
+
+def checker(method):
+    """Returns an engine asking model_check about one symbol at a time."""
+    def engine(knowledge, symbols):
+        return [symbol for symbol in symbols
+                if model_check(knowledge, symbol, method)]
+    return engine
+
+
+def knowledge_base(method):
+    """Returns an engine asking one compiled KnowledgeBase every symbol."""
+    def engine(knowledge, symbols):
+        return KnowledgeBase(knowledge, method=method).ask(symbols)
+    return engine
+
+
+def counting(knowledge, symbols):
+    """Returns the symbols true in every model, by counting models."""
+    try:
+        fractions = marginals(knowledge)
+    except ValueError:
+        # With no models, every symbol is true in all of them
+        return list(symbols)
+    return [symbol for symbol in symbols if fractions[symbol.name] == 1]
+
+
+# Engines, and the most symbols each is run on (None for no limit)
+ENGINES = {
+    "recursive": (checker("recursive"), 16),
+    "enumerate": (checker("enumerate"), 24),
+    "parallel": (checker("parallel"), 24),
+    "dpll": (checker("dpll"), None),
+    "sat": (checker("sat"), None),
+    "resolution": (checker("resolution"), 16),
+    "kb-enumerate": (knowledge_base("enumerate"), 22),
+    "kb-sat": (knowledge_base("sat"), None),
+    "count": (counting, 64),
+}
+
+
+def run(n, seed, engines):
+    """
+    Solves one puzzle with n characters with each engine. Returns the
+    time each engine took, or None if skipped, and whether they agreed
+    with each other and with the hidden solution, and found that the
+    puzzle with a contradiction added entails every symbol.
+    """
+    knowledge, symbols, model = generate(n, seed)
+    contradiction = And(knowledge, symbols[0], Not(symbols[0]))
+    times = dict()
+    answers = dict()
+    agree = True
+    for name in engines:
+        engine, limit = ENGINES[name]
+        if limit is not None and len(symbols) > limit:
+            times[name] = None
+            continue
+        start = time.perf_counter()
+        answers[name] = engine(knowledge, symbols)
+        times[name] = time.perf_counter() - start
+        agree = agree and engine(contradiction, symbols) == symbols
+
+    results = list(answers.values())
+    agree = (
+        agree and all(result == results[0] for result in results)
+        and all(model[symbol.name] for result in results for symbol in result)
+    )
+    return times, agree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[2, 4, 6, 8, 10, 12, 16, 24, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES,
+                        default=list(ENGINES))
+    args = parser.parse_args()
+
+    print("chars  " + "".join(f"{name:>14}" for name in args.engines))
+    failed = False
+    for n in args.sizes:
+        times, agree = run(n, args.seed + n, args.engines)
+        row = "".join(
+            f"{'-':>14}" if times[name] is None else f"{times[name]:>13.4f}s"
+            for name in args.engines
+        )
+        print(f"{n:>5}  {row}" + ("" if agree else "  MISMATCH"))
+        failed = failed or not agree
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
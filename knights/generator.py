@@ -0,0 +1,113 @@
+"""
+Random knights and knaves puzzle generator
+"""
+
+import itertools
+import random
+import string
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+def names(n):
+    """
+    Returns n character names: A to Z, then A1 to Z1 and so on.
+    """
+    letters = string.ascii_uppercase
+    return [
+        letters[i % 26] + (str(i // 26) if i >= 26 else "")
+        for i in range(n)
+    ]
+
+
+class Puzzle():
+    """
+    Knights and knaves puzzle with n characters.
+
+    Every character is secretly a knight or a knave, and makes statements
+    that are true exactly when the speaker is a knight, so the knowledge
+    base is always consistent with the hidden solution.
+    """
+
+    def __init__(self, n, seed=None, statements=1, depth=2, group=4):
+        self.rng = random.Random(seed)
+        self.people = names(n)
+        self.depth = depth
+        self.group = group
+        self.knight = {p: Symbol(f"{p} is a Knight") for p in self.people}
+        self.knave = {p: Symbol(f"{p} is a Knave") for p in self.people}
+
+        # Hidden solution, as a model over every symbol
+        self.model = dict()
+        for person in self.people:
+            is_knight = self.rng.random() < 0.5
+            self.model[self.knight[person].name] = is_knight
+            self.model[self.knave[person].name] = not is_knight
+
+        conjuncts = []
+        for person in self.people:
+            conjuncts.append(Or(self.knight[person], self.knave[person]))
+            conjuncts.append(Not(And(self.knight[person], self.knave[person])))
+        for person in self.people:
+            for _ in range(statements):
+                conjuncts.append(
+                    Biconditional(self.knight[person], self.statement(person))
+                )
+        self.knowledge = And(*conjuncts)
+
+    def symbols(self):
+        """Returns every symbol, in the order of puzzle.py."""
+        return [symbol for person in self.people
+                for symbol in (self.knight[person], self.knave[person])]
+
+    def statement(self, speaker):
+        """
+        Returns a random claim by speaker, true exactly if the speaker
+        is a knight.
+        """
+        honest = self.model[self.knight[speaker].name]
+        while True:
+            claim = self.claim(self.depth)
+            if claim.evaluate(self.model) == honest:
+                return claim
+
+    def claim(self, depth):
+        """Returns a random claim about the characters."""
+        kind = self.rng.randrange(7 if depth else 3)
+        person = self.rng.choice(self.people)
+        if kind == 0:
+            return self.knight[person]
+        if kind == 1:
+            return self.knave[person]
+        if kind == 2:
+            # "X and Y are of the same kind."
+            other = self.rng.choice(self.people)
+            return Biconditional(self.knight[person], self.knight[other])
+        if kind == 3:
+            return self.exactly()
+        if kind == 4:
+            # "X would say ..."
+            return Biconditional(self.knight[person], self.claim(depth - 1))
+        if kind == 5:
+            return Or(self.claim(depth - 1), self.claim(depth - 1))
+        return Implication(self.claim(depth - 1), Not(self.claim(depth - 1)))
+
+    def exactly(self):
+        """Returns a claim that exactly k of a group of characters are knaves."""
+        size = self.rng.randint(1, min(self.group, len(self.people)))
+        group = self.rng.sample(self.people, size)
+        k = self.rng.randint(0, size)
+        return Or(*[
+            And(*[self.knave[p] if p in knaves else self.knight[p]
+                  for p in group])
+            for knaves in itertools.combinations(group, k)
+        ])
+
+
+def generate(n, seed=None, **options):
+    """
+    Returns the knowledge base, symbols and hidden solution of a random
+    puzzle with n characters.
+    """
+    puzzle = Puzzle(n, seed, **options)
+    return puzzle.knowledge, puzzle.symbols(), puzzle.model
@@ -1,7 +1,39 @@
+import functools
+import heapq
 import itertools
+import multiprocessing
+import os
+import weakref
+
+from sat import Solver, count_models
 
 
 class Sentence():
+    """
+    Base class of logical sentences.
+
+    Sentences are hash-consed: constructing a sentence structurally equal
+    to one that is still alive returns that same node, so equal
+    subformulas are shared, and each node caches its hash and symbols.
+    """
+
+    __slots__ = ("_hash", "_symbols", "__weakref__")
+
+    # Every live sentence, keyed by its class and the identity of its parts
+    nodes = weakref.WeakValueDictionary()
+
+    @classmethod
+    def intern(cls, key, *parts):
+        """
+        Returns the live node of this class for `key`, creating it from
+        `parts` with `cls.build` if there is none.
+        """
+        sentence = Sentence.nodes.get(key)
+        if sentence is None:
+            sentence = object.__new__(cls)
+            sentence.build(*parts)
+            Sentence.nodes[key] = sentence
+        return sentence
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -13,7 +45,7 @@ class Sentence():
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return self._symbols
 
     @classmethod
     def validate(cls, sentence):
@@ -44,14 +76,26 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
+    __slots__ = ("name",)
+
+    def __new__(cls, name):
+        return cls.intern((cls, name), name)
+
+    def build(self, name):
         self.name = name
+        self._hash = hash(("symbol", name))
+        self._symbols = frozenset([name])
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
 
     def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+        return self is other or (
+            isinstance(other, Symbol) and self.name == other.name
+        )
 
     def __hash__(self):
-        return hash(("symbol", self.name))
+        return self._hash
 
     def __repr__(self):
         return self.name
@@ -65,20 +109,31 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
-
 
 class Not(Sentence):
-    def __init__(self, operand):
+
+    __slots__ = ("operand",)
+
+    def __new__(cls, operand):
         Sentence.validate(operand)
+        return cls.intern((cls, id(operand)), operand)
+
+    def build(self, operand):
         self.operand = operand
+        self._hash = hash(("not", hash(operand)))
+        self._symbols = operand.symbols()
+
+    def __reduce__(self):
+        return (type(self), (self.operand,))
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (
+            isinstance(other, Not) and self._hash == other._hash
+            and self.operand == other.operand
+        )
 
     def __hash__(self):
-        return hash(("not", hash(self.operand)))
+        return self._hash
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +144,36 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
-
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
+        return cls.intern((cls,) + tuple(map(id, conjuncts)), conjuncts)
+
+    def build(self, conjuncts):
+        self.conjuncts = conjuncts
+        self._hash = hash(
+            ("and", tuple(hash(conjunct) for conjunct in conjuncts))
+        )
+        self._symbols = frozenset().union(
+            *[conjunct.symbols() for conjunct in conjuncts]
+        )
+
+    def __reduce__(self):
+        return (type(self), self.conjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self._hash == other._hash
+            and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        return self._hash
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -114,8 +182,12 @@ class And(Sentence):
         return f"And({conjunctions})"
 
     def add(self, conjunct):
+        """
+        Returns the conjunction with `conjunct` added. Equal sentences
+        share one node, so sentences are never changed in place.
+        """
         Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
+        return And(*self.conjuncts, conjunct)
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -126,23 +198,36 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
-
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls.intern((cls,) + tuple(map(id, disjuncts)), disjuncts)
+
+    def build(self, disjuncts):
+        self.disjuncts = disjuncts
+        self._hash = hash(
+            ("or", tuple(hash(disjunct) for disjunct in disjuncts))
+        )
+        self._symbols = frozenset().union(
+            *[disjunct.symbols() for disjunct in disjuncts]
+        )
+
+    def __reduce__(self):
+        return (type(self), self.disjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self._hash == other._hash
+            and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+        return self._hash
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -157,24 +242,35 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
-
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
+        return cls.intern((cls, id(antecedent), id(consequent)),
+                          antecedent, consequent)
+
+    def build(self, antecedent, consequent):
         self.antecedent = antecedent
         self.consequent = consequent
+        self._hash = hash(("implies", hash(antecedent), hash(consequent)))
+        self._symbols = antecedent.symbols() | consequent.symbols()
+
+    def __reduce__(self):
+        return (type(self), (self.antecedent, self.consequent))
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (
+            isinstance(other, Implication) and self._hash == other._hash
+            and self.antecedent == other.antecedent
+            and self.consequent == other.consequent
+        )
 
     def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+        return self._hash
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -188,24 +284,34 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
-
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
+        return cls.intern((cls, id(left), id(right)), left, right)
+
+    def build(self, left, right):
         self.left = left
         self.right = right
+        self._hash = hash(("biconditional", hash(left), hash(right)))
+        self._symbols = left.symbols() | right.symbols()
+
+    def __reduce__(self):
+        return (type(self), (self.left, self.right))
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (
+            isinstance(other, Biconditional) and self._hash == other._hash
+            and self.left == other.left
+            and self.right == other.right
+        )
 
     def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+        return self._hash
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -217,16 +323,500 @@ class Biconditional(Sentence):
                     and not self.right.evaluate(model)))
 
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
 
+# Number of symbols enumerated together in one bitmask of models
+BLOCK_BITS = 12
+
+# Tasks per process when enumerating in parallel
+TASKS_PER_PROCESS = 4
+
+
+@functools.lru_cache(maxsize=64)
+def pattern(bit, bits):
+    """
+    Returns the bitmask over all 2 ** bits models, one bit per model,
+    of the models in which symbol number `bit` is true.
+    """
+    half = 1 << bit
+    unit = ((1 << half) - 1) << half
+    return unit * (((1 << (1 << bits)) - 1) // ((1 << (2 * half)) - 1))
+
+
+class CNF():
+    """
+    Clause form of logical sentences over integer variables.
+
+    Every symbol is given a positive variable number, and a literal is a
+    variable or its negation, as in DIMACS. Subformulas that can't be
+    written as clauses directly are named by Tseitin variables, kept as
+    gates so that their values follow from the values of the symbols.
+    """
+
+    def __init__(self):
+        # Symbol name for each variable, None for Tseitin variables
+        self.names = [None]
+        self.variables = dict()
+
+        # Asserted clauses, as tuples of literals
+        self.clauses = []
+
+        # Tseitin variables as (variable, operator, literals), in the order
+        # they were defined
+        self.gates = []
+
+        # Literal already naming each compiled sentence
+        self.literals = dict()
+
+    def __getstate__(self):
+        # Compiled sentences are only needed to compile more of them, so
+        # leave them out when sending clauses to other processes
+        state = self.__dict__.copy()
+        state["literals"] = dict()
+        return state
+
+    def variable(self, name):
+        """Returns the variable for a symbol name, adding it if new."""
+        if name not in self.variables:
+            self.variables[name] = len(self.names)
+            self.names.append(name)
+        return self.variables[name]
+
+    def gate(self, operator, literals):
+        """Returns a new Tseitin variable equivalent to a gate."""
+        self.names.append(None)
+        variable = len(self.names) - 1
+        self.gates.append((variable, operator, tuple(literals)))
+        return variable
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to sentence, adding gates as needed."""
+        if sentence in self.literals:
+            return self.literals[sentence]
+        if isinstance(sentence, Symbol):
+            literal = self.variable(sentence.name)
+        elif isinstance(sentence, Not):
+            literal = -self.literal(sentence.operand)
+        elif isinstance(sentence, And):
+            literal = self.gate("and", [self.literal(conjunct)
+                                        for conjunct in sentence.conjuncts])
+        elif isinstance(sentence, Or):
+            literal = self.gate("or", [self.literal(disjunct)
+                                       for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            literal = self.gate("or", [-self.literal(sentence.antecedent),
+                                       self.literal(sentence.consequent)])
+        elif isinstance(sentence, Biconditional):
+            literal = self.gate("iff", [self.literal(sentence.left),
+                                        self.literal(sentence.right)])
+        else:
+            raise TypeError(f"cannot compile {sentence!r}")
+        self.literals[sentence] = literal
+        return literal
+
+    def add(self, sentence, value=True):
+        """Asserts that sentence has the given truth value."""
+        if isinstance(sentence, Not):
+            self.add(sentence.operand, not value)
+        elif isinstance(sentence, And) and value:
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or) and not value:
+            for disjunct in sentence.disjuncts:
+                self.add(disjunct, False)
+        elif isinstance(sentence, Implication) and not value:
+            self.add(sentence.antecedent)
+            self.add(sentence.consequent, False)
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            if not value:
+                right = -right
+            self.add_clause((-left, right))
+            self.add_clause((left, -right))
+        else:
+            self.add_clause(self.disjuncts(sentence, value))
+
+    def disjuncts(self, sentence, value=True):
+        """
+        Returns literals whose disjunction is equivalent to sentence
+        having the given truth value.
+        """
+        if isinstance(sentence, Not):
+            return self.disjuncts(sentence.operand, not value)
+        if isinstance(sentence, Or) and value:
+            return [literal for disjunct in sentence.disjuncts
+                    for literal in self.disjuncts(disjunct)]
+        if isinstance(sentence, And) and not value:
+            return [literal for conjunct in sentence.conjuncts
+                    for literal in self.disjuncts(conjunct, False)]
+        if isinstance(sentence, Implication) and value:
+            return (self.disjuncts(sentence.antecedent, False)
+                    + self.disjuncts(sentence.consequent))
+        literal = self.literal(sentence)
+        return [literal if value else -literal]
+
+    def add_clause(self, literals):
+        """Adds a clause, dropping repeated literals and tautologies."""
+        clause = tuple(dict.fromkeys(literals))
+        if not any(-literal in clause for literal in clause):
+            self.clauses.append(clause)
+
+    def gate_clauses(self, start=0):
+        """
+        Returns the clauses defining every Tseitin variable, from gate
+        number `start` on.
+        """
+        clauses = []
+        for variable, operator, literals in self.gates[start:]:
+            if operator == "and":
+                clauses.extend((-variable, literal) for literal in literals)
+                clauses.append((variable,) + tuple(-l for l in literals))
+            elif operator == "or":
+                clauses.extend((variable, -literal) for literal in literals)
+                clauses.append((-variable,) + literals)
+            else:
+                left, right = literals
+                clauses.extend([(-variable, -left, right),
+                                (-variable, left, -right),
+                                (variable, left, right),
+                                (variable, -left, -right)])
+        return clauses
+
+    def evaluate(self, values, models):
+        """
+        Evaluates the clauses over many models at once.
+
+        `values` lists for each variable the bitmask of models in which it
+        is true, one bit per model, and `models` has the bit of every model
+        set. The values of gates are filled in, and the bitmask of models
+        satisfying every clause is returned.
+        """
+        for variable, operator, literals in self.gates:
+            inputs = [values[l] if l > 0 else models ^ values[-l]
+                      for l in literals]
+            if operator == "and":
+                value = models
+                for column in inputs:
+                    value &= column
+            elif operator == "or":
+                value = 0
+                for column in inputs:
+                    value |= column
+            else:
+                value = models ^ inputs[0] ^ inputs[1]
+            values[variable] = value
+
+        result = models
+        for clause in self.clauses:
+            value = 0
+            for literal in clause:
+                value |= values[literal] if literal > 0 else models ^ values[-literal]
+            result &= value
+            if not result:
+                break
+        return result
+
+    def truth(self, values, models, literal):
+        """Returns the bitmask of evaluated models in which literal is true."""
+        return values[literal] if literal > 0 else models ^ values[-literal]
+
+    def truth_table(self, symbols, fixed=()):
+        """
+        Enumerates every assignment to the symbol names in `symbols`,
+        the first of which take the truth values in `fixed`.
+
+        Models are evaluated in blocks of up to 2 ** BLOCK_BITS at once;
+        for each block, yields the values of every variable, the bitmask
+        of all models in the block and the bitmask of satisfying models.
+        """
+        variables = [self.variable(name) for name in symbols]
+        free = variables[len(fixed):]
+        bits = min(len(free), BLOCK_BITS)
+        models = (1 << (1 << bits)) - 1
+        for block in range(1 << (len(free) - bits)):
+            values = [0] * len(self.names)
+            for variable, value in zip(variables, fixed):
+                values[variable] = models if value else 0
+            for bit, variable in enumerate(free):
+                if bit < bits:
+                    values[variable] = pattern(bit, bits)
+                elif block >> (bit - bits) & 1:
+                    values[variable] = models
+            yield values, models, self.evaluate(values, models)
+
+
+class KnowledgeBase():
+    """
+    Knowledge base compiled once to answer many queries.
+
+    With method "sat" (or "dpll") every clause is loaded into one
+    incremental solver, and each query is a solve under the assumption
+    that the query is false. With "enumerate" the satisfying models are
+    kept as one bitmask over the truth table of the symbols seen so far.
+    Either way, sentences added later only compile the new conjunct.
+    """
+
+    def __init__(self, *sentences, method="sat"):
+        if method not in ("sat", "dpll", "enumerate"):
+            raise ValueError(f"unknown method {method}")
+        self.method = method
+
+        # Clause form, and how many of its gates and clauses the solver has
+        self.cnf = CNF()
+        self.solver = Solver(learning=method == "sat")
+        self.loaded_gates = 0
+        self.loaded_clauses = 0
+
+        # Symbol names in truth table order, and the satisfying models
+        self.symbols = []
+        self.models = 1
+
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence known to be true."""
+        Sentence.validate(sentence)
+        if self.method == "enumerate":
+            column = self.column(sentence)
+            self.models &= column
+        else:
+            self.cnf.add(sentence)
+            self.load()
+
+    def load(self):
+        """Loads clauses compiled since the last call into the solver."""
+        clauses = (self.cnf.gate_clauses(self.loaded_gates)
+                   + self.cnf.clauses[self.loaded_clauses:])
+        self.loaded_gates = len(self.cnf.gates)
+        self.loaded_clauses = len(self.cnf.clauses)
+        for clause in clauses:
+            self.solver.add_clause(clause)
+
+    def column(self, sentence):
+        """
+        Returns the bitmask of models over the truth table in which
+        sentence is true, first extending the table with its new symbols.
+        """
+        for name in sorted(sentence.symbols()):
+            if name not in self.symbols:
+                # Every model so far is a model with the new symbol either way
+                self.models |= self.models << (1 << len(self.symbols))
+                self.symbols.append(name)
+
+        models = (1 << (1 << len(self.symbols))) - 1
+        cnf = CNF()
+        literal = cnf.literal(sentence)
+        values = [0] * len(cnf.names)
+        for name, variable in cnf.variables.items():
+            values[variable] = pattern(self.symbols.index(name),
+                                       len(self.symbols))
+        cnf.evaluate(values, models)
+        return cnf.truth(values, models, literal)
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        Sentence.validate(query)
+        if self.method == "enumerate":
+            column = self.column(query)
+            return not self.models & ~column
+        literal = self.cnf.literal(query)
+        self.load()
+        return not self.solver.solve([-literal])
+
+    def ask(self, queries):
+        """Returns the queries entailed by the knowledge base, in order."""
+        return [query for query in queries if self.entails(query)]
+
+
+# Compiled knowledge base, query and stop flag of a parallel worker
+worker = None
+
+
+def start_worker(cnf, symbols, literal, split, stop):
+    """Keeps the state shared by every task of a parallel worker."""
+    global worker
+    worker = (cnf, symbols, literal, split, stop)
+
+
+def check_subspace(task):
+    """
+    Checks entailment over the models whose first symbols take the truth
+    values in the bits of `task`. Returns None if another task already
+    found a model of the knowledge base where the query is false.
+    """
+    cnf, symbols, literal, split, stop = worker
+    fixed = [task >> bit & 1 for bit in range(split)]
+    for values, models, satisfying in cnf.truth_table(symbols, fixed):
+        if stop.is_set():
+            return None
+        if satisfying & ~cnf.truth(values, models, literal):
+            stop.set()
+            return False
+    return True
+
+
+def parallel_check(cnf, symbols, literal, processes=None):
+    """
+    Checks that literal is true in every model of the clauses, splitting
+    the truth table between a pool of processes by fixing the first
+    symbols, and stopping every process once a counter-model is found.
+    """
+    processes = processes or os.cpu_count() or 1
+    split = min(max(len(symbols) - BLOCK_BITS, 0),
+                (TASKS_PER_PROCESS * processes - 1).bit_length())
+    stop = multiprocessing.Event()
+    with multiprocessing.Pool(processes, start_worker,
+                              (cnf, symbols, literal, split, stop)) as pool:
+        for entailed in pool.imap_unordered(check_subspace, range(1 << split)):
+            if entailed is False:
+                return False
+    return True
+
+
+def resolution_check(knowledge, query):
+    """
+    Checks if knowledge base entails query by resolution refutation.
+
+    The clauses of the knowledge base, with the definitions of any
+    Tseitin variables, are never resolved with each other: the clauses
+    of the negated query are the set of support, and each resolvent joins
+    it. Shortest supported clauses are resolved first, partners are found
+    through an index from literals to clauses, and tautologies and
+    subsumed clauses are dropped. Set of support is only complete when
+    the knowledge base is consistent, so if the supported clauses run out
+    without a refutation, the knowledge base clauses join them and are
+    resolved with each other too, until no new clauses are left.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    usable = cnf.gate_clauses() + cnf.clauses
+    gates = len(cnf.gates)
+    start = len(cnf.clauses)
+    cnf.add(query, False)
+    usable += cnf.gate_clauses(gates)
+    support = cnf.clauses[start:]
+
+    # Kept clauses by number, the numbers of those containing each literal,
+    # those that may be resolved with, supported clauses still to use, and
+    # unsupported clauses
+    numbers = itertools.count()
+    clauses = dict()
+    index = dict()
+    active = set()
+    queue = []
+    unsupported = set()
+
+    def subsumed(clause):
+        """Checks if a kept clause is a subset of clause."""
+        for literal in clause:
+            for other in index.get(literal, ()):
+                if len(clauses[other]) <= len(clause) and clauses[other] <= clause:
+                    return True
+        return False
+
+    def remove(number):
+        for literal in clauses.pop(number):
+            index[literal].discard(number)
+        active.discard(number)
+        unsupported.discard(number)
+
+    def keep(clause, supported):
+        """Adds a clause unless subsumed, removing clauses it subsumes."""
+        if subsumed(clause):
+            return
+        candidates = sorted((index.get(literal, set()) for literal in clause),
+                            key=len)
+        for number in set.intersection(*candidates) if candidates else ():
+            remove(number)
+        number = next(numbers)
+        clauses[number] = clause
+        for literal in clause:
+            index.setdefault(literal, set()).add(number)
+        if supported:
+            heapq.heappush(queue, (len(clause), number))
+        else:
+            active.add(number)
+            unsupported.add(number)
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    for clause in usable:
+        keep(frozenset(clause), False)
+    for clause in support:
+        if not clause:
+            return True
+        keep(frozenset(clause), True)
+
+    while True:
+        while queue:
+            _, number = heapq.heappop(queue)
+            if number not in clauses:
+                continue
+            given = clauses[number]
+            active.add(number)
+            for literal in given:
+                for other in list(index.get(-literal, ())):
+                    if other not in active or other not in clauses:
+                        continue
+                    resolvent = ((given - {literal})
+                                 | (clauses[other] - {-literal}))
+                    if not resolvent:
+                        return True
+                    if any(-l in resolvent for l in resolvent):
+                        continue
+                    keep(resolvent, True)
+                    if number not in clauses:
+                        break
+                if number not in clauses:
+                    break
+
+        # An inconsistent knowledge base may not be refuted through the
+        # negated query, so resolve its clauses with each other too
+        if not unsupported:
+            return False
+        for number in sorted(unsupported):
+            active.discard(number)
+            heapq.heappush(queue, (len(clauses[number]), number))
+        unsupported.clear()
+
+
+def model_check(knowledge, query, method="sat", processes=None):
+    """
+    Checks if knowledge base entails query.
+
+    By default this checks that the knowledge base together with the
+    negated query is unsatisfiable, using the CDCL solver, or the DPLL
+    solver with `method` "dpll". Enumerating models is only done when
+    asked for: "enumerate" evaluates the compiled knowledge base over the
+    truth table as bit vectors, "parallel" does the same split between
+    `processes` processes, and "recursive" evaluates the sentences on
+    one model at a time. "resolution" refutes the negated query instead.
+    """
+    if method in ("sat", "dpll"):
+        cnf = CNF()
+        cnf.add(knowledge)
+        cnf.add(query, False)
+        solver = Solver(cnf.gate_clauses() + cnf.clauses,
+                        learning=method == "sat")
+        return not solver.solve()
+    if method == "resolution":
+        return resolution_check(knowledge, query)
+    if method in ("enumerate", "parallel"):
+        cnf = CNF()
+        cnf.add(knowledge)
+        literal = cnf.literal(query)
+        symbols = sorted(knowledge.symbols() | query.symbols())
+        if method == "parallel":
+            return parallel_check(cnf, symbols, literal, processes)
+        for values, models, satisfying in cnf.truth_table(symbols):
+            if satisfying & ~cnf.truth(values, models, literal):
+                return False
+        return True
+    if method != "recursive":
+        raise ValueError(f"unknown method {method}")
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
@@ -257,7 +847,34 @@ def model_check(knowledge, query):
                     check_all(knowledge, query, remaining, model_false))
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = set(knowledge.symbols() | query.symbols())
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def model_count(knowledge, cache=None):
+    """
+    Returns the number of models of the knowledge base over its symbols.
+    """
+    cnf = CNF()
+    for name in sorted(knowledge.symbols()):
+        cnf.variable(name)
+    cnf.add(knowledge)
+    return count_models(cnf.gate_clauses() + cnf.clauses,
+                        range(1, len(cnf.names)), cache)
+
+
+def marginals(knowledge):
+    """
+    Returns, for each symbol in the knowledge base, the fraction of the
+    models of the knowledge base in which it is true.
+    """
+    cache = dict()
+    total = model_count(knowledge, cache)
+    if not total:
+        raise ValueError("knowledge base has no models")
+    return {
+        name: model_count(And(knowledge, Symbol(name)), cache) / total
+        for name in sorted(knowledge.symbols())
+    }
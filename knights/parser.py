@@ -0,0 +1,241 @@
+"""
+Parser and bulk loader for logical sentences
+
+Reads the syntax written by `Sentence.formula()`, and DIMACS CNF.
+Usage: python parser.py [megabytes] to measure parsing throughput.
+"""
+
+import random
+import re
+import sys
+import time
+
+from logic import And, Biconditional, CNF, Implication, Not, Or, Symbol
+
+# Operators, parentheses, or a symbol name made of anything else
+TOKEN = re.compile(r"<=>|=>|[()¬∧∨~!&|]|[^()¬∧∨~!&|<=>]+")
+
+# Binding strength of each operator, with ASCII spellings accepted
+# alongside the ones written by formula()
+PRECEDENCE = {
+    "¬": 5, "~": 5, "!": 5,
+    "∧": 4, "&": 4,
+    "∨": 3, "|": 3,
+    "=>": 2,
+    "<=>": 1,
+}
+NOT = {"¬", "~", "!"}
+BINARY = {"∧": And, "&": And, "∨": Or, "|": Or,
+          "=>": Implication, "<=>": Biconditional}
+
+
+def parse(text):
+    """
+    Returns the sentence written in text, in the syntax of `formula()`.
+
+    From loosest to tightest binding, the operators are "<=>", "=>"
+    (grouping to the right), "∨", "∧" and "¬"; "|", "&", "~" and "!"
+    are accepted as ASCII spellings. Chains of "∧" or "∨" become one
+    And or Or. Parsing is by operator precedence without recursion.
+    """
+    tokens = [token.strip() for token in TOKEN.findall(text)]
+    tokens = [token for token in tokens if token]
+
+    # Parsed sentences, and pending operators with their operand counts
+    operands = []
+    operators = []
+
+    def reduce():
+        operator, count = operators.pop()
+        if operator in NOT:
+            operands[-1] = Not(operands[-1])
+        else:
+            parts = operands[-count:]
+            del operands[-count:]
+            operands.append(BINARY[operator](*parts))
+
+    expect_operand = True
+    for position, token in enumerate(tokens):
+        if expect_operand:
+            if token in NOT or token == "(":
+                operators.append([token, 1])
+            elif token in PRECEDENCE or token == ")":
+                raise ValueError(f"unexpected {token!r} at token {position}")
+            else:
+                operands.append(Symbol(token))
+                expect_operand = False
+
+        elif token == ")":
+            while operators and operators[-1][0] != "(":
+                reduce()
+            if not operators:
+                raise ValueError(f"unexpected ')' at token {position}")
+            operators.pop()
+
+        elif token in BINARY:
+            precedence = PRECEDENCE[token]
+            while operators and operators[-1][0] != "(" and (
+                PRECEDENCE[operators[-1][0]] > precedence
+                or operators[-1][0] == token == "<=>"
+            ):
+                reduce()
+            if (operators and BINARY.get(operators[-1][0]) in (And, Or)
+                    and BINARY[operators[-1][0]] is BINARY[token]):
+                operators[-1][1] += 1
+            else:
+                operators.append([token, 2])
+            expect_operand = True
+
+        else:
+            raise ValueError(f"unexpected {token!r} at token {position}")
+
+    if expect_operand:
+        raise ValueError("unexpected end of formula")
+    while operators:
+        if operators[-1][0] == "(":
+            raise ValueError("expected ')' at end of formula")
+        reduce()
+    return operands[0]
+
+
+def load(filename):
+    """
+    Returns the conjunction of the sentences in a file, one per line.
+    Blank lines and lines starting with "#" are skipped.
+    """
+    with open(filename, encoding="utf-8") as f:
+        return And(*[
+            parse(line) for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ])
+
+
+def parse_dimacs(text, compiled=False):
+    """
+    Returns the clauses of a DIMACS CNF file, whose variable numbers
+    become symbol names. With `compiled`, returns a CNF whose variables
+    keep the DIMACS numbering; otherwise returns an And of Or sentences.
+    """
+    count = 0
+    numbers = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] == "c":
+            continue
+        if line[0] == "p":
+            count = int(line.split()[2])
+            continue
+        if line[0] == "%":
+            break
+        numbers.extend(map(int, line.split()))
+
+    clauses = []
+    clause = []
+    for number in numbers:
+        if number:
+            clause.append(number)
+        else:
+            clauses.append(clause)
+            clause = []
+    if clause:
+        clauses.append(clause)
+
+    if compiled:
+        cnf = CNF()
+        count = max([count] + [abs(number) for number in numbers])
+        for variable in range(1, count + 1):
+            cnf.variable(str(variable))
+        for clause in clauses:
+            cnf.add_clause(clause)
+        return cnf
+
+    symbols = dict()
+
+    def literal(number):
+        if abs(number) not in symbols:
+            symbols[abs(number)] = Symbol(str(abs(number)))
+        symbol = symbols[abs(number)]
+        return symbol if number > 0 else Not(symbol)
+
+    return And(*[Or(*[literal(number) for number in clause])
+                 for clause in clauses])
+
+
+def load_dimacs(filename, compiled=False):
+    """
+    Returns the clauses of a DIMACS CNF file, as for `parse_dimacs`.
+    """
+    with open(filename, encoding="utf-8") as f:
+        return parse_dimacs(f.read(), compiled)
+
+
+def sample_formulas(megabytes, rng):
+    """
+    Returns random formulas, one per line, totalling about `megabytes`.
+    """
+    symbols = [Symbol(f"S{i}") for i in range(1000)]
+
+    def sentence(depth):
+        if depth == 0:
+            return rng.choice(symbols)
+        kind = rng.randrange(5)
+        if kind == 0:
+            return Not(sentence(depth - 1))
+        if kind == 1:
+            return And(sentence(depth - 1), sentence(depth - 1))
+        if kind == 2:
+            return Or(sentence(depth - 1), sentence(depth - 1))
+        if kind == 3:
+            return Implication(sentence(depth - 1), sentence(depth - 1))
+        return Biconditional(sentence(depth - 1), sentence(depth - 1))
+
+    lines = []
+    size = 0
+    while size < megabytes * 1e6:
+        lines.append(sentence(3).formula())
+        size += len(lines[-1].encode()) + 1
+    return "\n".join(lines)
+
+
+def sample_dimacs(megabytes, rng):
+    """
+    Returns a random 3-CNF in DIMACS format of about `megabytes`.
+    """
+    variables = 10000
+    lines = []
+    size = 0
+    while size < megabytes * 1e6:
+        clause = [rng.choice((1, -1)) * rng.randint(1, variables)
+                  for _ in range(3)]
+        lines.append(" ".join(map(str, clause)) + " 0")
+        size += len(lines[-1]) + 1
+    return f"p cnf {variables} {len(lines)}\n" + "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python parser.py [megabytes]")
+    megabytes = float(sys.argv[1]) if len(sys.argv) == 2 else 2
+    rng = random.Random(0)
+
+    text = sample_formulas(megabytes, rng)
+    start = time.perf_counter()
+    sentences = [parse(line) for line in text.splitlines()]
+    elapsed = time.perf_counter() - start
+    size = len(text.encode()) / 1e6
+    print(f"formulas: {len(sentences)} sentences, {size:.1f} MB "
+          f"in {elapsed:.2f}s ({size / elapsed:.2f} MB/s)")
+
+    text = sample_dimacs(megabytes, rng)
+    size = len(text) / 1e6
+    for compiled in (False, True):
+        start = time.perf_counter()
+        parse_dimacs(text, compiled)
+        elapsed = time.perf_counter() - start
+        kind = "CNF" if compiled else "sentences"
+        print(f"DIMACS to {kind}: {size:.1f} MB "
+              f"in {elapsed:.2f}s ({size / elapsed:.2f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -68,13 +68,12 @@ def main():
     ]
     for puzzle, knowledge in puzzles:
         print(puzzle)
-        knowledge.add(game_rules)
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
-                    print(f"    {symbol}")
+            knowledge = And(knowledge, game_rules)
+            for symbol in KnowledgeBase(knowledge).ask(symbols):
+                print(f"    {symbol}")
 
 
 if __name__ == "__main__":
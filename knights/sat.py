@@ -0,0 +1,453 @@
+"""
+Satisfiability solver over clauses of integer literals
+"""
+
+import heapq
+import itertools
+
+# Conflicts before the first restart, and the growth of that limit
+RESTART = 100
+RESTART_GROWTH = 1.5
+
+# Decay of variable activity after each conflict
+DECAY = 0.95
+
+
+class Solver():
+    """
+    Incremental DPLL / CDCL satisfiability solver.
+
+    A clause is a sequence of non-zero integers, a positive integer being
+    a variable and a negative one its negation, as in DIMACS. Clauses are
+    propagated through two watched literals each. With `learning`, every
+    conflict is analysed into a learned clause and the solver backjumps
+    (CDCL); without it, the last untried decision is flipped (DPLL).
+    With `pure_literals`, literals whose negation occurs in no open clause
+    are assumed true before searching.
+    """
+
+    def __init__(self, clauses=(), learning=True, pure_literals=True):
+        self.learning = learning
+        self.pure_literals = pure_literals
+
+        # Per variable state, indexed from 1
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.phases = [False]
+        self.activity = [0.0]
+        self.increment = 1.0
+        self.heap = []
+
+        # Clauses with two or more literals, and the clauses watching
+        # each literal
+        self.clauses = []
+        self.learnts = []
+        self.watches = dict()
+
+        # Assigned literals in order, the trail index where each decision
+        # level starts, and whether each level's decision was already flipped
+        self.trail = []
+        self.limits = []
+        self.flipped = []
+        self.head = 0
+
+        # False once the clauses are known to be unsatisfiable
+        self.ok = True
+        self.model = None
+        self.conflicts = 0
+        self.decisions = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def grow(self, variable):
+        """Makes room for variables up to `variable`."""
+        while len(self.values) <= variable:
+            self.values.append(None)
+            self.levels.append(0)
+            self.reasons.append(None)
+            self.phases.append(False)
+            self.activity.append(0.0)
+            heapq.heappush(self.heap, (0.0, len(self.values) - 1))
+
+    def value(self, literal):
+        """Returns the truth value of a literal, or None if unassigned."""
+        value = self.values[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def add_clause(self, literals):
+        """
+        Adds a clause. Returns False if the clauses are now known to be
+        unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        self.backtrack(0)
+
+        clause = []
+        for literal in dict.fromkeys(literals):
+            self.grow(abs(literal))
+            value = self.value(literal)
+            if value is True or -literal in clause:
+                return True
+            if value is None:
+                clause.append(literal)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.watch(clause)
+            self.clauses.append(clause)
+        return self.ok
+
+    def watch(self, clause):
+        """Watches the first two literals of a clause."""
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def enqueue(self, literal, reason):
+        """Assigns a literal at the current decision level."""
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Propagates every assigned literal through the watched clauses.
+        Returns a clause whose literals are all false, or None.
+        """
+        values = self.values
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watchers = self.watches.get(false)
+            if not watchers:
+                continue
+
+            kept = []
+            for index, clause in enumerate(watchers):
+                # Keep the false literal in the second watched position
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+
+                # Clause already satisfied by its other watched literal
+                first = clause[0]
+                value = values[abs(first)]
+                if value is not None and value == (first > 0):
+                    kept.append(clause)
+                    continue
+
+                # Look for another literal that isn't false to watch
+                for k in range(2, len(clause)):
+                    other = clause[k]
+                    other_value = values[abs(other)]
+                    if other_value is None or other_value == (other > 0):
+                        clause[1], clause[k] = other, false
+                        self.watches.setdefault(other, []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value is not None:
+                        kept.extend(watchers[index + 1:])
+                        self.watches[false] = kept
+                        self.head = len(self.trail)
+                        return clause
+                    self.enqueue(first, clause)
+            self.watches[false] = kept
+        return None
+
+    def backtrack(self, level):
+        """Undoes every assignment above decision level `level`."""
+        if len(self.limits) <= level:
+            return
+        start = self.limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.values[variable] = None
+            self.reasons[variable] = None
+            self.phases[variable] = literal > 0
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.limits[level:]
+        del self.flipped[level:]
+        self.head = len(self.trail)
+
+    def bump(self, variable):
+        """Raises the activity of a variable involved in a conflict."""
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+        if self.values[variable] is None:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def analyze(self, conflict):
+        """
+        Derives a learned clause from a conflict at the first unique
+        implication point. Returns the clause, whose first literal is the
+        one it asserts, and the level to backjump to.
+        """
+        level = len(self.limits)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        literal = None
+
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                variable = abs(other)
+                if variable not in seen and self.levels[variable] > 0:
+                    seen.add(variable)
+                    self.bump(variable)
+                    if self.levels[variable] == level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+
+            # Move back along the trail to the next literal to resolve on
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Watch the literal assigned last among the rest
+        highest = max(range(1, len(learnt)),
+                      key=lambda i: self.levels[abs(learnt[i])])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def decide(self):
+        """Returns the most active unassigned variable, or None."""
+        while self.heap:
+            _, variable = heapq.heappop(self.heap)
+            if self.values[variable] is None:
+                return variable
+        return None
+
+    def pure(self, assumptions):
+        """
+        Returns the unassigned literals, not on assumed variables, whose
+        negation occurs in no clause that is still open.
+        """
+        assumed = {abs(literal) for literal in assumptions}
+        literals = set()
+        for clause in itertools.chain(self.clauses, self.learnts):
+            if any(self.value(literal) for literal in clause):
+                continue
+            literals.update(literal for literal in clause
+                            if self.values[abs(literal)] is None)
+        return [literal for literal in literals
+                if -literal not in literals and abs(literal) not in assumed]
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses are satisfiable with every literal in
+        `assumptions` true, storing a satisfying assignment of each
+        variable in `self.model`, or False otherwise.
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        self.backtrack(0)
+        if self.propagate() is not None:
+            self.ok = False
+            return False
+
+        assumptions = list(assumptions)
+        for literal in assumptions:
+            self.grow(abs(literal))
+        if self.pure_literals:
+            assumptions.extend(self.pure(assumptions))
+
+        restart = self.conflicts + RESTART
+        restart_limit = RESTART
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.limits:
+                    self.ok = False
+                    return False
+
+                if self.learning:
+                    learnt, level = self.analyze(conflict)
+                    self.backtrack(level)
+                    if len(learnt) == 1:
+                        self.enqueue(learnt[0], None)
+                    else:
+                        self.watch(learnt)
+                        self.learnts.append(learnt)
+                        self.enqueue(learnt[0], learnt)
+                    self.increment /= DECAY
+                    continue
+
+                # Flip the most recent decision not yet flipped
+                level = len(self.limits)
+                while level > len(assumptions) and self.flipped[level - 1]:
+                    level -= 1
+                if level <= len(assumptions):
+                    self.backtrack(0)
+                    return False
+                decision = self.trail[self.limits[level - 1]]
+                self.backtrack(level - 1)
+                self.limits.append(len(self.trail))
+                self.flipped.append(True)
+                self.enqueue(-decision, None)
+                continue
+
+            if self.learning and self.conflicts >= restart:
+                restart_limit *= RESTART_GROWTH
+                restart = self.conflicts + int(restart_limit)
+                self.backtrack(0)
+                continue
+
+            # Assume the next assumption, each at its own decision level
+            level = len(self.limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self.value(literal)
+                if value is False:
+                    self.backtrack(0)
+                    return False
+                self.limits.append(len(self.trail))
+                self.flipped.append(True)
+                if value is None:
+                    self.enqueue(literal, None)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                self.model = {
+                    variable: self.values[variable]
+                    for variable in range(1, len(self.values))
+                }
+                self.backtrack(0)
+                return True
+            self.decisions += 1
+            self.limits.append(len(self.trail))
+            self.flipped.append(False)
+            self.enqueue(variable if self.phases[variable] else -variable,
+                         None)
+
+
+def count_models(clauses, variables, cache=None):
+    """
+    Returns the number of assignments to `variables`, which must include
+    every variable in the clauses, that satisfy every clause.
+
+    The clauses are split into components sharing no variables, whose
+    counts multiply, and the count of each component is cached, so
+    `cache` can be shared between calls over related clauses.
+    """
+    clauses = [frozenset(clause) for clause in clauses]
+
+    # An empty clause can never be satisfied
+    if not all(clauses):
+        return 0
+    clauses = [clause for clause in clauses
+               if not any(-literal in clause for literal in clause)]
+    return count(clauses, frozenset(variables),
+                 dict() if cache is None else cache)
+
+
+def assign(clauses, literal):
+    """
+    Returns the clauses simplified by making literal true, or None if
+    that falsifies a clause.
+    """
+    simplified = []
+    for clause in clauses:
+        if literal in clause:
+            continue
+        if -literal in clause:
+            clause = clause - {-literal}
+            if not clause:
+                return None
+        simplified.append(clause)
+    return simplified
+
+
+def count(clauses, variables, cache):
+    """
+    Counts the models of clauses over variables, after unit propagation,
+    as the product of the counts of its components.
+    """
+    while True:
+        unit = next((clause for clause in clauses if len(clause) == 1), None)
+        if unit is None:
+            break
+        (literal,) = unit
+        clauses = assign(clauses, literal)
+        if clauses is None:
+            return 0
+        variables = variables - {abs(literal)}
+
+    # Group clauses into components connected by shared variables
+    parent = dict()
+
+    def find(variable):
+        while parent.setdefault(variable, variable) != variable:
+            parent[variable] = parent[parent[variable]]
+            variable = parent[variable]
+        return variable
+
+    for clause in clauses:
+        first, *rest = [abs(literal) for literal in clause]
+        root = find(first)
+        for variable in rest:
+            parent[find(variable)] = root
+    components = dict()
+    for clause in clauses:
+        root = find(abs(next(iter(clause))))
+        components.setdefault(root, []).append(clause)
+
+    # Variables in no clause can take either value
+    total = 1 << (len(variables) - len(parent))
+    for component in components.values():
+        total *= count_component(component, cache)
+        if not total:
+            return 0
+    return total
+
+
+def count_component(clauses, cache):
+    """
+    Counts the models of a connected set of clauses over its variables
+    by branching on its most frequent variable.
+    """
+    key = frozenset(clauses)
+    if key in cache:
+        return cache[key]
+
+    occurrences = dict()
+    for clause in clauses:
+        for literal in clause:
+            occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+    variable = max(occurrences, key=occurrences.get)
+    variables = frozenset(occurrences) - {variable}
+
+    total = 0
+    for literal in (variable, -variable):
+        simplified = assign(clauses, literal)
+        if simplified is not None:
+            total += count(simplified, variables, cache)
+    cache[key] = total
+    return total
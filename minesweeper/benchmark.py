@@ -0,0 +1,95 @@
+"""
+Benchmark of MinesweeperAI inference engines on large boards
+
+Usage: python benchmark.py [--boards NAME ...] [--engines NAME ...]
+                           [--games N] [--seed SEED]
+"""
+
+import argparse
+import random
+import time
+
+from minesweeper import ENGINES, Minesweeper, MinesweeperAI
+
+# Board sizes as height, width and number of mines
+BOARDS = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (16, 30, 99),
+    "large": (50, 50, 500),
+    "huge": (100, 100, 2000),
+}
+
+
+def play(height, width, mines, seed, engine):
+    """
+    Plays one game with the AI until it hits a mine or runs out of moves.
+    Returns whether it won, the time taken by each call to add_knowledge,
+    the size of the knowledge base after each call, and the number of
+    cells the AI found to be mines or safe by inference.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines, engine=engine)
+    times = []
+    sizes = []
+    guesses = 0
+    won = False
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                won = ai.mines == game.mines
+                break
+            guesses += 1
+        if game.is_mine(move):
+            guesses -= 1
+            break
+        start = time.perf_counter()
+        ai.add_knowledge(move, game.nearby_mines(move))
+        times.append(time.perf_counter() - start)
+        sizes.append(len(ai.knowledge))
+
+    # Every safe cell was either guessed or inferred
+    deductions = len(ai.mines) + len(ai.safes) - guesses
+    return won, times, sizes, deductions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boards", nargs="+", choices=BOARDS,
+                        default=["expert", "large", "huge"])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES,
+                        default=list(ENGINES))
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'board':>12}  {'engine':>7}  {'wins':>7}  {'calls':>7}  "
+          f"{'ms/call':>8}  {'max ms':>8}  {'max KB':>6}  {'deduced/s':>9}")
+    for name in args.boards:
+        height, width, mines = BOARDS[name]
+        for engine in args.engines:
+            wins = 0
+            deductions = 0
+            times = []
+            sizes = []
+            for game in range(args.games):
+                won, game_times, game_sizes, game_deductions = play(
+                    height, width, mines, args.seed + game, engine
+                )
+                wins += won
+                deductions += game_deductions
+                times.extend(game_times)
+                sizes.extend(game_sizes)
+            print(f"{name:>12}  {engine:>7}  {wins:>3}/{args.games:<3}  "
+                  f"{len(times):>7}  "
+                  f"{1000 * sum(times) / max(1, len(times)):>8.3f}  "
+                  f"{1000 * max(times, default=0):>8.3f}  "
+                  f"{max(sizes, default=0):>6}  "
+                  f"{deductions / max(sum(times), 1e-9):>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
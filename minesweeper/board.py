@@ -0,0 +1,57 @@
+import random
+
+import numpy as np
+
+from minesweeper import Minesweeper
+
+
+class ArrayMinesweeper(Minesweeper):
+    """
+    Minesweeper game representation backed by NumPy arrays
+
+    Mines are placed by sampling cells without replacement in one call,
+    and every cell's count of nearby mines is computed once at creation,
+    so `is_mine` and `nearby_mines` are single array lookups.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, seed=None):
+        # Set initial width, height, and number of mines
+        self.height = height
+        self.width = width
+
+        # Draw the seed from `random` unless given, so seeding `random`
+        # seeds the board as it does for Minesweeper
+        if seed is None:
+            seed = random.getrandbits(64)
+        rng = np.random.default_rng(seed)
+
+        # Add mines at distinct random cells
+        cells = rng.choice(height * width, size=mines, replace=False)
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[cells] = True
+        self.mines = {
+            (int(i), int(j)) for i, j in zip(*np.divmod(cells, width))
+        }
+
+        # Sum each 3x3 window of the board padded with empty cells,
+        # leaving out the cell itself
+        padded = np.pad(self.board.astype(np.uint8), 1)
+        counts = np.zeros((height, width), dtype=np.uint8)
+        for di in range(3):
+            for dj in range(3):
+                counts += padded[di:di + height, dj:dj + width]
+        self.counts = counts - self.board
+
+        # At first, player has found no mines
+        self.mines_found = set()
+
+    def is_mine(self, cell):
+        return bool(self.board[cell])
+
+    def nearby_mines(self, cell):
+        """
+        Returns the number of mines that are
+        within one row and column of a given cell,
+        not including the cell itself.
+        """
+        return int(self.counts[cell])
@@ -1,6 +1,15 @@
+import collections
 import itertools
+import math
 import random
 
+# Random cells drawn when looking for an unknown cell, before falling
+# back to scanning the whole board
+RANDOM_TRIES = 100
+
+# Ways MinesweeperAI can draw inferences from its sentences
+ENGINES = ("subset", "linear")
+
 
 class Minesweeper:
     """
@@ -81,6 +90,32 @@ class Minesweeper:
         """
         return self.mines_found == self.mines
 
+    def reveal(self, cell, revealed=()):
+        """
+        Returns the cells uncovered by clicking a safe cell, as pairs of
+        a cell and its number of nearby mines. If a cell has no nearby
+        mines, every cell around it is uncovered as well, so the whole
+        connected region of such cells and its border is uncovered in
+        one breadth-first search. Cells in `revealed` are left out.
+        """
+        uncovered = []
+        seen = {cell}
+        queue = collections.deque([cell])
+        while queue:
+            current = queue.popleft()
+            count = self.nearby_mines(current)
+            uncovered.append((current, count))
+            if count:
+                continue
+            for i in range(current[0] - 1, current[0] + 2):
+                for j in range(current[1] - 1, current[1] + 2):
+                    if (0 <= i < self.height and 0 <= j < self.width
+                            and (i, j) not in seen
+                            and (i, j) not in revealed):
+                        seen.add((i, j))
+                        queue.append((i, j))
+        return uncovered
+
 
 class Sentence:
     """
@@ -139,15 +174,163 @@ class Sentence:
         return f"{self.count}->{self.cells}"
 
 
+class CompactSentence:
+    """
+    Immutable, hashable logical statement about a Minesweeper game
+    The cells are an integer bitmask, where bit i * width + j stands for
+    cell (i, j), shifted down by `offset` so that the lowest cell is bit
+    0 and the mask of a sentence stays small on large boards. Subset and
+    difference tests are integer operations, and updating a sentence
+    returns a new one. Use `from_cells` to build one from (i, j) cells.
+    """
+
+    __slots__ = ("mask", "offset", "count", "width", "_hash")
+
+    def __init__(self, mask, offset, count, width):
+        # Shift the mask down to its lowest cell
+        if mask:
+            shift = (mask & -mask).bit_length() - 1
+            mask >>= shift
+            offset += shift
+        else:
+            offset = 0
+        self.mask = mask
+        self.offset = offset
+        self.count = count
+        self.width = width
+        self._hash = None
+
+    @classmethod
+    def from_cells(cls, cells, count, width):
+        """
+        Returns the sentence that `count` of `cells` are mines, on a
+        board `width` cells wide.
+        """
+        mask = 0
+        for i, j in cells:
+            mask |= 1 << (i * width + j)
+        return cls(mask, 0, count, width)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactSentence):
+            return NotImplemented
+        return (self.mask == other.mask and self.offset == other.offset
+                and self.count == other.count)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.mask, self.offset, self.count))
+        return self._hash
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __iter__(self):
+        mask = self.mask
+        offset = self.offset
+        width = self.width
+        while mask:
+            low = mask & -mask
+            yield divmod(offset + low.bit_length() - 1, width)
+            mask ^= low
+
+    def indices(self):
+        """
+        Yields the board index i * width + j of each cell (i, j).
+        """
+        mask = self.mask
+        offset = self.offset
+        while mask:
+            low = mask & -mask
+            yield offset + low.bit_length() - 1
+            mask ^= low
+
+    def __contains__(self, cell):
+        index = cell[0] * self.width + cell[1] - self.offset
+        return index >= 0 and bool(self.mask >> index & 1)
+
+    def aligned(self, other):
+        """
+        Returns the mask of other's cells, shifted to this sentence's
+        offset. Cells below this sentence's lowest cell are dropped.
+        """
+        shift = other.offset - self.offset
+        return other.mask << shift if shift >= 0 else other.mask >> -shift
+
+    def __le__(self, other):
+        """Returns whether every cell of this sentence is in other."""
+        if self.offset < other.offset:
+            return not self.mask
+        return not other.aligned(self) & ~other.mask
+
+    def __lt__(self, other):
+        """Returns whether the cells are a proper subset of other's."""
+        return self.mask.bit_count() < other.mask.bit_count() and self <= other
+
+    def __sub__(self, other):
+        """
+        Returns the sentence about this sentence's cells not in other,
+        whose count is the difference of the counts. Only true if other's
+        cells are a subset of this sentence's.
+        """
+        return CompactSentence(
+            self.mask & ~self.aligned(other), self.offset,
+            self.count - other.count, self.width
+        )
+
+    def without(self, known, mines):
+        """
+        Returns the sentence left after leaving out known cells, given
+        as a mask over the whole board, with `mines` the board mask of
+        the cells known to be mines.
+        """
+        known = self.mask & (known >> self.offset)
+        if not known:
+            return self
+        mines = (self.mask & (mines >> self.offset)).bit_count()
+        return CompactSentence(
+            self.mask & ~known, self.offset, self.count - mines, self.width
+        )
+
+    @property
+    def cells(self):
+        return set(self)
+
+    def known_mines(self):
+        """
+        Returns the set of all cells in the sentence known to be mines.
+        """
+        return self.cells if len(self) == self.count else set()
+
+    def known_safes(self):
+        """
+        Returns the set of all cells in the sentence known to be safe.
+        """
+        return self.cells if self.count == 0 else set()
+
+    def __str__(self):
+        return f"{self.cells} = {self.count}"
+
+    def __repr__(self):
+        return f"{self.count}->{self.cells}"
+
+
 class MinesweeperAI:
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
-        # Set initial height and width
+    def __init__(self, height=8, width=8, mines=None, engine="subset"):
+        # Set initial height and width, and the number of mines if known
         self.height = height
         self.width = width
+        self.mine_count = mines
+
+        # Combine sentences by subset differences ("subset") or by
+        # Gaussian elimination ("linear")
+        if engine not in ENGINES:
+            raise ValueError(f"unknown inference engine {engine!r}")
+        self.engine = engine
 
         # Keep track of which cells have been clicked on
         self.moves_made = set()
@@ -156,26 +339,115 @@ class MinesweeperAI:
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # The same as masks over the board, bit i * width + j standing for
+        # cell (i, j), of the mines and of every known cell
+        self.mine_mask = 0
+        self.known_mask = 0
+
+        # Cells known to be safe that have not been clicked on yet
+        self.safe_moves = set()
+
+        # Sentences about the game known to be true, by id
+        self.knowledge = dict()
+
+        # Ids of the sentences mentioning each cell, by its board index
+        # i * width + j, and the id of each distinct sentence
+        self.index = dict()
+        self.sentence_ids = dict()
+        self.ids = itertools.count()
+
+        # Cells found to be mines (True) or safe (False), not yet marked,
+        # and ids of sentences added since they were last combined
+        self.conclusions = []
+        self.pending = collections.deque()
+
+        # Cells of sentences added since the last Gaussian elimination
+        self.changed = set()
+
+        # Mine placements counted for each group of connected sentences
+        self.counts = dict()
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.conclusions.append((cell, True))
+        self.propagate()
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self.conclusions.append((cell, False))
+        self.propagate()
+
+    def propagate(self):
+        """
+        Marks every pending conclusion, updating only the sentences that
+        mention each cell. Sentences left deciding all of their cells add
+        those cells to the conclusions in turn.
+        """
+        while self.conclusions:
+            cell, is_mine = self.conclusions.pop()
+            if cell in self.mines or cell in self.safes:
+                continue
+            index = cell[0] * self.width + cell[1]
+            self.known_mask |= 1 << index
+            if is_mine:
+                self.mines.add(cell)
+                self.mine_mask |= 1 << index
+            else:
+                self.safes.add(cell)
+                if cell not in self.moves_made:
+                    self.safe_moves.add(cell)
+            for key in self.index.pop(index, ()):
+                self.add_sentence(self.retract(key))
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base, leaving out cells already
+        known to be mines or safe. Empty and duplicate sentences are
+        dropped, and a sentence deciding all of its cells is not kept:
+        its cells are queued as conclusions instead.
+        Returns True if anything new was learned.
+        """
+        sentence = sentence.without(self.known_mask, self.mine_mask)
+
+        if not sentence:
+            return False
+        if sentence.count == 0 or sentence.count == len(sentence):
+            self.conclusions.extend(
+                (cell, sentence.count > 0) for cell in sentence
+            )
+            return True
+
+        if sentence in self.sentence_ids:
+            return False
+        key = next(self.ids)
+        self.knowledge[key] = sentence
+        self.sentence_ids[sentence] = key
+        for index in sentence.indices():
+            self.index.setdefault(index, set()).add(key)
+        self.pending.append(key)
+        if self.engine == "linear":
+            self.changed.add(next(sentence.indices()))
+        return True
+
+    def retract(self, key):
+        """
+        Removes a sentence from the knowledge base and returns it.
+        """
+        sentence = self.knowledge.pop(key)
+        del self.sentence_ids[sentence]
+        for index in sentence.indices():
+            keys = self.index.get(index)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.index[index]
+        return sentence
 
     def add_knowledge(self, cell, count):
         """
@@ -192,28 +464,32 @@ class MinesweeperAI:
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
-        # mark the cell as a move that has been made
-        self.moves_made.add(cell)
-
-        # mark the cell as safe
-        self.mark_safe(cell)
-
-        # add a new sentence to the AI's knowledge base
-        neighbors = self.return_cells_neighbors(cell)
-        new_knowledge = Sentence(cells=neighbors, count=count)
-        for mine in self.mines:
-            new_knowledge.mark_mine(mine)
-        for safe in self.safes:
-            new_knowledge.mark_safe(safe)
+        self.add_all_knowledge([(cell, count)])
 
-        for mine in new_knowledge.known_mines():
-            self.mark_mine(mine)
-        for safe in new_knowledge.known_safes():
-            self.mark_safe(safe)
-
-        self.knowledge.append(new_knowledge)
-
-        self.combiner()
+    def add_all_knowledge(self, revealed):
+        """
+        Adds what the board told us about many safe cells at once, as
+        pairs of a cell and its number of neighboring mines, such as the
+        cells uncovered by `Minesweeper.reveal`. Every sentence is added
+        before drawing inferences, so the whole update costs one pass.
+        """
+        # mark every cell as a move that has been made, and as safe
+        for cell, _ in revealed:
+            self.moves_made.add(cell)
+            self.safe_moves.discard(cell)
+            self.conclusions.append((cell, False))
+        self.propagate()
+
+        # add a new sentence for each cell, only checking its neighbors
+        # against the known mines and safes
+        for cell, count in revealed:
+            self.add_sentence(self.neighbors_sentence(cell, count))
+        self.propagate()
+
+        if self.engine == "linear":
+            self.eliminate()
+        else:
+            self.combiner()
 
     def make_safe_move(self):
         """
@@ -223,27 +499,179 @@ class MinesweeperAI:
 
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
+        The safe cells not yet clicked on are kept in self.safe_moves.
         """
-        for move in self.safes:
-            if move not in self.moves_made:
-                return move
+        return next(iter(self.safe_moves), None)
 
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Should choose among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        If the total number of mines is known, chooses a cell least likely
+        to be a mine; otherwise chooses randomly.
+        """
+        move = self.make_safe_move()
+        if move is not None:
+            return move
+
+        probabilities = None
+        if self.mine_count is not None:
+            probabilities = self.mine_probabilities()
+        if probabilities is None:
+            return self.random_cell()
+
+        cells, outside = probabilities
+        best = min(cells.values(), default=1)
+        if outside is not None and outside < best:
+            move = self.random_cell(frontier=False)
+            if move is not None:
+                return move
+        if not cells:
+            return None
+        return random.choice([
+            cell for cell, probability in cells.items()
+            if probability <= best + 1e-12
+        ])
+
+    def random_cell(self, frontier=True):
+        """
+        Returns a random cell not known to be safe or a mine, or None if
+        there is no such cell. Unless `frontier`, cells mentioned by the
+        knowledge base are left out.
         """
+        for _ in range(RANDOM_TRIES):
+            cell = (random.randrange(self.height), random.randrange(self.width))
+            if (cell not in self.mines and cell not in self.safes
+                    and (frontier or cell[0] * self.width + cell[1]
+                         not in self.index)):
+                return cell
+
+        # Most cells are known, so list the rest
         possible_moves = [
             (i, j)
             for i in range(self.height)
             for j in range(self.width)
-            if (i, j) not in self.moves_made and (i, j) not in self.mines
+            if (i, j) not in self.mines and (i, j) not in self.safes
+            and (frontier or i * self.width + j not in self.index)
         ]
-        move = random.choice(possible_moves) if len(
-            possible_moves) > 1 else None
-        return move
+        return random.choice(possible_moves) if possible_moves else None
+
+    def mine_probabilities(self):
+        """
+        Returns the probability that each cell in the knowledge base is a
+        mine, and the probability for every other unknown cell (None if
+        there are none), given the total number of mines. Returns None if
+        the knowledge base is inconsistent with that total.
+
+        Groups of cells connected by shared sentences are counted apart,
+        and every placement of their mines is weighted by the number of
+        ways to place the remaining mines in the other unknown cells.
+        """
+        unknown = self.height * self.width - len(self.mines) - len(self.safes)
+        outside = unknown - len(self.index)
+        remaining = self.mine_count - len(self.mines)
+
+        # Count each group, reusing the counts of groups left unchanged
+        counts = dict()
+        components = []
+        seen = set()
+        for index in self.index:
+            if index in seen:
+                continue
+            indices, keys = self.component(index)
+            seen.update(indices)
+            cells = [divmod(index, self.width) for index in indices]
+            sentences = [self.knowledge[key] for key in keys]
+            signature = frozenset(sentences)
+            if signature not in self.counts:
+                self.counts[signature] = count_placements(cells, sentences)
+            counts[signature] = self.counts[signature]
+            components.append(counts[signature])
+        self.counts = counts
+
+        def ways(placed):
+            left = remaining - placed
+            return math.comb(outside, left) if 0 <= left <= outside else 0
+
+        # Placements of all groups together, and of all groups before
+        # and after each one
+        before = [{0: 1}]
+        for total, _ in components:
+            before.append(convolve(before[-1], total))
+        after = [{0: 1}]
+        for total, _ in reversed(components):
+            after.append(convolve(after[-1], total))
+        after.reverse()
+
+        weight = sum(ways_ * ways(placed)
+                     for placed, ways_ in before[-1].items())
+        if weight == 0:
+            return None
+
+        probabilities = dict()
+        for k, (_, marginals) in enumerate(components):
+            others = convolve(before[k], after[k + 1])
+            weights = dict()
+            for cells_ways in marginals.values():
+                for placed in cells_ways:
+                    if placed not in weights:
+                        weights[placed] = sum(
+                            ways_ * ways(placed + other)
+                            for other, ways_ in others.items()
+                        )
+            for cell, cells_ways in marginals.items():
+                probabilities[cell] = sum(
+                    ways_ * weights[placed]
+                    for placed, ways_ in cells_ways.items()
+                ) / weight
+
+        if outside == 0:
+            return probabilities, None
+        expected = sum(
+            ways_ * (math.comb(outside - 1, remaining - placed - 1)
+                     if 0 < remaining - placed <= outside else 0)
+            for placed, ways_ in before[-1].items()
+        )
+        return probabilities, expected / weight
+
+    def component(self, index):
+        """
+        Returns the board indices of the cells connected to the cell at
+        `index` through shared sentences, in breadth-first order, and the
+        ids of the sentences about them.
+        """
+        indices = [index]
+        seen = {index}
+        keys = set()
+        for current in indices:
+            for key in self.index[current]:
+                if key in keys:
+                    continue
+                keys.add(key)
+                for other in self.knowledge[key].indices():
+                    if other not in seen:
+                        seen.add(other)
+                        indices.append(other)
+        return indices, keys
+
+    def neighbors_sentence(self, cell, count):
+        """
+        Returns the sentence that `count` of the cells around `cell` are
+        mines, built row by row as a bitmask.
+        """
+        i, j = cell
+        top = max(i - 1, 0)
+        left = max(j - 1, 0)
+        row = (1 << (min(j + 1, self.width - 1) - left + 1)) - 1
+        mask = 0
+        for k in range(min(i + 1, self.height - 1) - top + 1):
+            mask |= row << (k * self.width)
+        mask &= ~(1 << ((i - top) * self.width + j - left))
+        return CompactSentence(
+            mask, top * self.width + left, count, self.width
+        )
 
     def return_cells_neighbors(self, cell):
         """
@@ -257,41 +685,232 @@ class MinesweeperAI:
         return neighbors
 
     def combiner(self):
-        modified = False
-        while True:
-            modified = False
-            for sentence1, sentence2 in itertools.combinations(self.knowledge, 2):
-                if sentence1 != sentence2 and sentence1.cells.issubset(sentence2.cells):
-                    new_cells = sentence2.cells - sentence1.cells
-                    count = sentence2.count - sentence1.count
-                    new_sentence = Sentence(cells=new_cells, count=count)
-
-                    for cell in new_cells:
-                        if (cell in sentence1.known_safes()) or (
-                            cell in sentence2.known_safes()
-                        ):
-                            new_sentence.mark_safe(cell)
-                        elif (cell in sentence1.known_mines()) or (
-                            cell in sentence2.known_mines()
-                        ):
-                            new_sentence.mark_mine(cell)
-
-                    if new_sentence not in self.knowledge:
-                        for mine in self.mines:
-                            new_sentence.mark_mine(mine)
-                        for safe in self.safes:
-                            new_sentence.mark_safe(safe)
-                        for mine in new_sentence.known_mines():
-                            self.mark_mine(mine)
-                        for safe in new_sentence.known_safes():
-                            self.mark_safe(safe)
-                        self.knowledge.append(new_sentence)
-                        modified = True
-            if not modified:
-                break
-
-        for sentence in self.knowledge:
-            for safe in self.safes:
-                sentence.mark_safe(safe)
-            for mine in self.safes:
-                sentence.mark_safe(mine)
+        """
+        Adds the difference of every sentence and each sentence it is
+        a subset of to the knowledge base, until nothing new is learned.
+
+        Only sentences added or changed since the last call are combined,
+        each with the sentences sharing one of its cells, found through
+        the index. Every sentence an update changes is re-added, and so
+        queued again, which reaches the same conclusions as comparing
+        every pair of sentences until nothing changes.
+        """
+        while self.pending:
+            key = self.pending.popleft()
+            sentence = self.knowledge.get(key)
+            if sentence is None:
+                continue
+
+            others = set()
+            for index in sentence.indices():
+                others.update(self.index[index])
+            others.discard(key)
+
+            for other in others:
+                other_sentence = self.knowledge.get(other)
+                if other_sentence is None:
+                    continue
+                if sentence < other_sentence:
+                    self.add_sentence(other_sentence - sentence)
+                elif other_sentence < sentence:
+                    self.add_sentence(sentence - other_sentence)
+            self.propagate()
+
+    def eliminate(self):
+        """
+        Combines sentences by subset differences, then treats the
+        sentences about each group of connected cells changed since the
+        last call as a linear system, with one 0/1 variable per cell, and
+        reduces it by Gaussian elimination. Marks every cell fixed by a
+        reduced equation, and repeats until nothing new is learned.
+        """
+        while self.pending:
+            self.combiner()
+            starts = self.changed
+            self.changed = set()
+
+            seen = set()
+            for start in starts:
+                if start in seen or start not in self.index:
+                    continue
+                indices, keys = self.component(start)
+                seen.update(indices)
+                rows = [
+                    (dict.fromkeys(self.knowledge[key].indices(), 1),
+                     self.knowledge[key].count)
+                    for key in keys
+                ]
+                for index, is_mine in bounded(reduce_rows(rows, indices)):
+                    self.conclusions.append(
+                        (divmod(index, self.width), is_mine)
+                    )
+            self.propagate()
+
+
+def convolve(first, second):
+    """
+    Returns the number of ways to place a total number of mines, given
+    the ways to place each number of mines in two independent groups.
+    """
+    total = dict()
+    for a, ways_a in first.items():
+        for b, ways_b in second.items():
+            total[a + b] = total.get(a + b, 0) + ways_a * ways_b
+    return total
+
+
+def count_placements(cells, sentences):
+    """
+    Returns the number of ways to place mines in cells consistent with
+    every sentence, by number of mines placed, and for each cell the
+    number of those placements in which it is a mine.
+
+    Cells are decided in order, merging partial placements that leave
+    every sentence needing the same number of mines, so the work grows
+    with the number of distinct partial placements rather than with the
+    number of placements. Counts are dicts from a number of mines to a
+    number of placements.
+    """
+    position = {cell: i for i, cell in enumerate(cells)}
+
+    # Sentences about each cell, with how many of their cells come later
+    touches = [[] for _ in cells]
+    for s, sentence in enumerate(sentences):
+        later = sorted(position[cell] for cell in sentence.cells)
+        for rank, i in enumerate(later):
+            touches[i].append((s, len(later) - rank - 1))
+
+    def step(state, i, mine):
+        state = list(state)
+        for s, left in touches[i]:
+            state[s] -= mine
+            if not 0 <= state[s] <= left:
+                return None
+        return tuple(state)
+
+    def add(counts, key, ways, shift):
+        target = counts.setdefault(key, dict())
+        for placed, number in ways.items():
+            target[placed + shift] = target.get(placed + shift, 0) + number
+
+    # Placements of the first i cells by mines each sentence still needs
+    forward = [{tuple(sentence.count for sentence in sentences): {0: 1}}]
+    for i in range(len(cells)):
+        layer = dict()
+        for state, ways in forward[-1].items():
+            for mine in (0, 1):
+                following = step(state, i, mine)
+                if following is not None:
+                    add(layer, following, ways, mine)
+        forward.append(layer)
+
+    # Completions of the remaining cells from each partial placement
+    backward = [None] * len(cells) + [{
+        state: {0: 1} for state in forward[-1]
+    }]
+    marginals = dict()
+    for i in reversed(range(len(cells))):
+        layer = dict()
+        mined = dict()
+        for state, ways in forward[i].items():
+            for mine in (0, 1):
+                following = step(state, i, mine)
+                if following is None or following not in backward[i + 1]:
+                    continue
+                completions = backward[i + 1][following]
+                add(layer, state, completions, mine)
+                if mine:
+                    for placed, number in convolve(ways, completions).items():
+                        mined[placed + 1] = mined.get(placed + 1, 0) + number
+        backward[i] = layer
+        marginals[cells[i]] = mined
+
+    return forward[-1].get(tuple(0 for _ in sentences), dict()), marginals
+
+
+def reduce_rows(rows, variables):
+    """
+    Returns the rows of a linear system in reduced row echelon form, by
+    Gaussian elimination over the integers, pivoting on variables in the
+    given order. A row is a dict from variable to non-zero coefficient,
+    and the constant the row sums to. Each row is kept divided by the
+    greatest common divisor of its numbers; rows left with no
+    coefficients are dropped.
+
+    The rows using each variable are indexed, and the shortest one is
+    taken as pivot, so sparse systems stay sparse.
+    """
+    rows = dict(enumerate(rows))
+    columns = dict()
+    for k, (coefficients, _) in rows.items():
+        for variable in coefficients:
+            columns.setdefault(variable, set()).add(k)
+
+    pivots = []
+    used = set()
+    for variable in variables:
+        candidates = [k for k in columns.get(variable, ()) if k not in used]
+        if not candidates:
+            continue
+        p = min(candidates, key=lambda k: len(rows[k][0]))
+        pivots.append(p)
+        used.add(p)
+        coefficients, constant = rows[p]
+        scale = coefficients[variable]
+
+        # Subtract the pivot row from every other row using the variable
+        for k in list(columns[variable]):
+            if k == p:
+                continue
+            other, other_constant = rows[k]
+            factor = other[variable]
+            combined = {v: scale * c for v, c in other.items()}
+            for v, c in coefficients.items():
+                value = combined.get(v, 0) - factor * c
+                if value:
+                    combined[v] = value
+                else:
+                    combined.pop(v, None)
+            rows[k] = normalize(
+                combined, scale * other_constant - factor * constant
+            )
+            for v in other.keys() - combined.keys():
+                columns[v].discard(k)
+            for v in combined.keys() - other.keys():
+                columns.setdefault(v, set()).add(k)
+
+    return [rows[k] for k in pivots if rows[k][0]]
+
+
+def normalize(coefficients, constant):
+    """
+    Returns a row divided by the greatest common divisor of its numbers,
+    with the sign of its lowest variable's coefficient made positive.
+    """
+    divisor = math.gcd(constant, *coefficients.values())
+    if coefficients and coefficients[min(coefficients)] < 0:
+        divisor = -divisor
+    if divisor in (0, 1):
+        return coefficients, constant
+    return (
+        {v: c // divisor for v, c in coefficients.items()},
+        constant // divisor,
+    )
+
+
+def bounded(rows):
+    """
+    Yields (variable, is_mine) for every 0/1 variable fixed by a row
+    reaching its largest or smallest possible sum: then every variable
+    with a positive coefficient is a mine and every one with a negative
+    coefficient is safe, or the other way around.
+    """
+    for coefficients, constant in rows:
+        high = sum(c for c in coefficients.values() if c > 0)
+        low = sum(c for c in coefficients.values() if c < 0)
+        if constant == high:
+            for variable, c in coefficients.items():
+                yield variable, c > 0
+        elif constant == low:
+            for variable, c in coefficients.items():
+                yield variable, c < 0
@@ -0,0 +1,169 @@
+"""
+Headless batch simulator and win-rate benchmark for the Minesweeper AI
+
+Usage: python simulator.py [--height H] [--width W] [--mines N | --density D]
+                           [--games N] [--processes N] [--seed SEED]
+                           [--board list|array] [--engine subset|linear]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from minesweeper import ENGINES, Minesweeper, MinesweeperAI
+
+# Parts of a game, by share of its safe cells revealed, over which the
+# knowledge base size is averaged
+STAGES = 10
+
+# Share of cells that are mines when not given, as on an expert board
+DENSITY = 99 / (16 * 30)
+
+
+def game_class(board):
+    """
+    Returns the Minesweeper class for a board representation, importing
+    the NumPy-backed one only when it is asked for.
+    """
+    if board == "array":
+        from board import ArrayMinesweeper
+        return ArrayMinesweeper
+    return Minesweeper
+
+
+def play_game(task):
+    """
+    Plays one seeded game with the AI. Returns whether it won, whether
+    it ever marked a cell wrongly, and for each move the duration of the
+    AI's knowledge update and the knowledge base size and revealed cells after it.
+    """
+    height, width, mines, seed, board, engine = task
+    random.seed(seed)
+    game = game_class(board)(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines,
+                       engine=engine)
+    calls = []
+    won = False
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                won = ai.mines == game.mines
+                break
+        if game.is_mine(move):
+            break
+        start = time.perf_counter()
+        ai.add_all_knowledge(game.reveal(move, ai.moves_made))
+        elapsed = time.perf_counter() - start
+        calls.append((elapsed, len(ai.knowledge), len(ai.moves_made)))
+
+    # Cells are never unmarked, so checking them once at the end suffices
+    sound = ai.mines <= game.mines and not ai.safes & game.mines
+    return won, sound, calls
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of values by the nearest-rank method.
+    """
+    values = sorted(values)
+    if not values:
+        return 0
+    rank = max(1, -(-q * len(values) // 100))
+    return values[int(rank) - 1]
+
+
+def simulate(height, width, mines, games, processes=None, seed=0,
+             board="list", engine="subset"):
+    """
+    Plays `games` games across a process pool. Returns the result of
+    every game and the elapsed wall-clock time.
+    """
+    tasks = [(height, width, mines, seed + game, board, engine)
+             for game in range(games)]
+    processes = processes or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = list(pool.imap_unordered(
+            play_game, tasks, chunksize=max(1, games // (processes * 8))
+        ))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--width", type=int, default=30)
+    mines = parser.add_mutually_exclusive_group()
+    mines.add_argument("--mines", type=int, default=None)
+    mines.add_argument("--density", type=float, default=None,
+                       help="share of cells that are mines")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=None,
+                        help="fail if the update p99 exceeds this many ms")
+    parser.add_argument("--board", choices=["list", "array"], default="list",
+                        help="board representation (array needs NumPy)")
+    parser.add_argument("--engine", choices=ENGINES, default="subset",
+                        help="MinesweeperAI inference engine")
+    args = parser.parse_args()
+
+    cells = args.height * args.width
+    if args.mines is not None:
+        mines = args.mines
+    elif args.density is not None:
+        mines = round(args.density * cells)
+    else:
+        mines = round(DENSITY * cells)
+    if not 0 < mines < cells:
+        sys.exit("The board must have at least one mine and one safe cell.")
+
+    results, elapsed = simulate(
+        args.height, args.width, mines, args.games, args.processes,
+        args.seed, args.board, args.engine
+    )
+    wins = sum(won for won, _, _ in results)
+    calls = [call for _, _, game_calls in results for call in game_calls]
+    times = [duration * 1000 for duration, _, _ in calls]
+    sizes = [size for _, size, _ in calls]
+
+    print(f"{args.height}x{args.width} with {mines} mines: {args.games} games "
+          f"in {elapsed:.2f}s ({args.games / elapsed:,.1f} games/sec)")
+    print(f"  win rate: {wins}/{args.games} ({100 * wins / args.games:.1f}%)")
+    print(f"  moves: {len(calls)} ({len(calls) / elapsed:,.1f} moves/sec)")
+    print(f"  knowledge update ms: mean {sum(times) / max(1, len(times)):.3f}, "
+          f"p50 {percentile(times, 50):.3f}, p99 {percentile(times, 99):.3f}, "
+          f"max {max(times, default=0):.3f}")
+    print(f"  knowledge base size: mean {sum(sizes) / max(1, len(sizes)):.1f}, "
+          f"max {max(sizes, default=0)}")
+
+    # Knowledge base size as the game goes on
+    stages = [[] for _ in range(STAGES)]
+    for _, size, revealed in calls:
+        stage = min(STAGES - 1, revealed * STAGES // (cells - mines))
+        stages[stage].append(size)
+    for stage, stage_sizes in enumerate(stages):
+        if stage_sizes:
+            print(f"    {100 * stage // STAGES:>3}-{100 * (stage + 1) // STAGES}% "
+                  f"revealed: mean {sum(stage_sizes) / len(stage_sizes):.1f} "
+                  f"sentences over {len(stage_sizes)} moves")
+
+    problems = []
+    if not all(sound for _, sound, _ in results):
+        problems.append("the AI marked a cell wrongly")
+    if args.budget is not None and percentile(times, 99) > args.budget:
+        problems.append(f"knowledge update p99 over {args.budget} ms")
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
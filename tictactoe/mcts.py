@@ -0,0 +1,187 @@
+"""
+Monte Carlo Tree Search Tic Tac Toe Player
+"""
+
+import importlib
+import math
+import multiprocessing
+import random
+import time
+
+import tictactoe as ttt
+
+# Default search budget when neither iterations nor a time limit is given
+ITERATIONS = 2000
+
+# UCT exploration constant
+EXPLORATION = math.sqrt(2)
+
+# Random playouts run from every newly expanded node
+ROLLOUTS = 4
+
+
+class Node():
+    """
+    Search tree node for a single board position.
+    """
+
+    def __init__(self, game, board, parent=None, action=None):
+        self.board = board
+        self.parent = parent
+        self.action = action
+        self.children = []
+        self.terminal = game.terminal(board)
+        self.untried = [] if self.terminal else list(game.actions(board))
+
+        # Player who moved into this node; rewards are from their perspective
+        self.mover = game.player(parent.board) if parent else None
+
+        self.visits = 0
+        self.score = 0.0
+
+    def best_child(self, exploration):
+        """
+        Returns the child maximising the UCT score.
+        """
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: (
+                child.score / child.visits
+                + exploration * math.sqrt(log_visits / child.visits)
+            )
+        )
+
+
+def reward(game, board, mover):
+    """
+    Returns the reward in [0, 1] of a finished board for `mover`.
+    """
+    value = game.utility(board)
+    if mover == game.O:
+        value = -value
+    return (value + 1) / 2
+
+
+def rollout(game, board, rng):
+    """
+    Plays uniformly random moves from board until the game ends
+    and returns the final board and the number of moves played.
+    """
+    moves = 0
+    while not game.terminal(board):
+        board = game.result(board, rng.choice(list(game.actions(board))))
+        moves += 1
+    return board, moves
+
+
+def search(game, board, iterations=None, time_limit=None,
+           rollouts=ROLLOUTS, exploration=EXPLORATION, rng=None,
+           stats=None):
+    """
+    Runs UCT from board and returns the root node of the search tree.
+
+    The search stops after `iterations` iterations or `time_limit`
+    seconds, whichever comes first. `stats` works as for `ttt.minimax`:
+    it counts the boards visited and can cancel the search.
+    """
+    stats = dict() if stats is None else stats
+    stats.setdefault("nodes", 0)
+    rng = rng or random.Random()
+    if iterations is None and time_limit is None:
+        iterations = ITERATIONS
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    root = Node(game, board)
+    count = 0
+    while iterations is None or count < iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if stats.get("cancelled"):
+            raise ttt.Cancelled
+        count += 1
+
+        # Selection
+        node = root
+        while not node.untried and node.children:
+            node = node.best_child(exploration)
+
+        # Expansion
+        if node.untried:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            child = Node(game, game.result(node.board, action), node, action)
+            node.children.append(child)
+            node = child
+            stats["nodes"] += 1
+
+        # Simulation, batched so each expansion is scored by several playouts
+        finals = []
+        for _ in range(rollouts):
+            final, moves = rollout(game, node.board, rng)
+            finals.append(final)
+            stats["nodes"] += moves
+
+        # Backpropagation
+        while node is not None:
+            node.visits += rollouts
+            if node.mover is not None:
+                node.score += sum(
+                    reward(game, final, node.mover) for final in finals
+                )
+            node = node.parent
+
+    return root
+
+
+def root_statistics(game_name, board, iterations, time_limit,
+                    rollouts, exploration, seed):
+    """
+    Runs one independent search and returns the visit count and score
+    of every root action, so results from several processes can be merged,
+    along with the number of boards visited.
+    """
+    game = importlib.import_module(game_name)
+    stats = dict()
+    root = search(game, board, iterations, time_limit,
+                  rollouts, exploration, random.Random(seed), stats)
+    return {
+        child.action: (child.visits, child.score) for child in root.children
+    }, stats["nodes"]
+
+
+def mcts(board, iterations=None, time_limit=None, processes=1,
+         rollouts=ROLLOUTS, exploration=EXPLORATION, game=ttt, seed=None,
+         stats=None):
+    """
+    Returns the action chosen by Monte Carlo Tree Search for the current
+    player on the board.
+
+    `game` is any module providing the same `player`, `actions`, `result`,
+    `terminal` and `utility` functions as tictactoe. With `processes` > 1
+    the search is root-parallel: every process grows its own tree with
+    the full budget and the root statistics are summed. `stats` works as
+    for `ttt.minimax`, though a root-parallel search only reports its
+    node count once every process has finished.
+    """
+    if game.terminal(board):
+        return None
+
+    if processes > 1:
+        seeds = random.Random(seed).sample(range(2 ** 32), processes)
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(root_statistics, [
+                (game.__name__, board, iterations, time_limit,
+                 rollouts, exploration, worker_seed)
+                for worker_seed in seeds
+            ])
+        visits = dict()
+        for statistics, nodes in results:
+            for action, (count, _) in statistics.items():
+                visits[action] = visits.get(action, 0) + count
+            if stats is not None:
+                stats["nodes"] = stats.get("nodes", 0) + nodes
+        return max(visits, key=visits.get)
+
+    root = search(game, board, iterations, time_limit,
+                  rollouts, exploration, random.Random(seed), stats)
+    return max(root.children, key=lambda child: child.visits).action
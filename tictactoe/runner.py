@@ -1,6 +1,7 @@
 import tictactoe as ttt
 import pygame
 import sys
+import threading
 import time
 
 
@@ -12,19 +13,49 @@ black = (0, 0, 0)
 white = (255, 255, 255)
 
 screen = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
 
+smallFont = pygame.font.Font("tictactoe/OpenSans-Regular.ttf", 20)
 mediumFont = pygame.font.Font("tictactoe/OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("tictactoe/OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("tictactoe/OpenSans-Regular.ttf", 60)
 
+# Minimum time the AI appears to think, so its move isn't instant
+AI_DELAY = 0.5
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
+
+# Background AI search: its thread, stats, start time and result
+ai_thread = None
+ai_stats = None
+ai_start = None
+ai_moves = []
+
+
+def think(board, stats, moves):
+    """
+    Runs the AI search in a background thread and records its move.
+    """
+    try:
+        moves.append(ttt.minimax(board, stats))
+    except ttt.Cancelled:
+        pass
+
+
+def cancel_ai():
+    """
+    Cancels any AI search that is still running.
+    """
+    if ai_stats is not None:
+        ai_stats["cancelled"] = True
+
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            cancel_ai()
             sys.exit()
 
     screen.fill(black)
@@ -106,15 +137,32 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, searching in the background so the window
+        # keeps rendering while the computer thinks
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
+            if ai_thread is None:
+                ai_stats = {"nodes": 0}
+                ai_start = time.perf_counter()
+                ai_moves = []
+                ai_thread = threading.Thread(
+                    target=think, args=(board, ai_stats, ai_moves),
+                    daemon=True
+                )
+                ai_thread.start()
+
+            elapsed = time.perf_counter() - ai_start
+            if ai_moves and elapsed >= AI_DELAY:
+                board = ttt.result(board, ai_moves[0])
+                ai_thread = None
             else:
-                ai_turn = True
+                rate = ai_stats["nodes"] / elapsed if elapsed else 0
+                dots = "." * (int(elapsed * 3) % 3 + 1)
+                status = smallFont.render(
+                    f"Thinking{dots:<3} {rate:,.0f} nodes/sec", True, white
+                )
+                statusRect = status.get_rect()
+                statusRect.center = ((width / 2), 65)
+                screen.blit(status, statusRect)
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -125,20 +173,25 @@ while True:
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
                         board = ttt.result(board, (i, j))
 
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+        # Play again once the game is over, or reset it mid-game
+        againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+        again = mediumFont.render(
+            "Play Again" if game_over else "Reset", True, black
+        )
+        againRect = again.get_rect()
+        againRect.center = againButton.center
+        pygame.draw.rect(screen, white, againButton)
+        screen.blit(again, againRect)
+        click, _, _ = pygame.mouse.get_pressed()
+        if click == 1:
+            mouse = pygame.mouse.get_pos()
+            if againButton.collidepoint(mouse):
+                time.sleep(0.2)
+                cancel_ai()
+                user = None
+                board = ttt.initial_state()
+                ai_thread = None
+                ai_stats = None
 
     pygame.display.flip()
+    clock.tick(60)
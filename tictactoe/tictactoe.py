@@ -9,6 +9,12 @@ O = "O"
 EMPTY = None
 
 
+class Cancelled(Exception):
+    """
+    Raised when a search is cancelled through its stats dictionary.
+    """
+
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -119,11 +125,22 @@ def utility(board):
         return 0
 
 
-def minimax(board):
+def minimax(board, stats=None):
     """
     Returns the optimal action for the current player on the board.
+
+    If `stats` is given, `stats["nodes"]` counts the boards searched, and
+    setting `stats["cancelled"]` from another thread aborts the search
+    with `Cancelled`.
     """
+    def visit():
+        if stats is not None:
+            if stats.get("cancelled"):
+                raise Cancelled
+            stats["nodes"] = stats.get("nodes", 0) + 1
+
     def min_value(board):
+        visit()
         if terminal(board):
             return utility(board)
         min_utility = float('inf')
@@ -139,6 +156,7 @@ def minimax(board):
         return [min_utility, best_action]
 
     def max_value(board):
+        visit()
         if terminal(board):
             return utility(board)
         max_utility = float('-inf')
@@ -0,0 +1,211 @@
+"""
+Headless self-play tournament and throughput benchmark for Tic Tac Toe AIs
+
+Usage: python tournament.py [--x ENGINE] [--o ENGINE] [--games N] ...
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import tictactoe as ttt
+import mcts
+
+# Engines that always play perfectly, so games between them must be draws
+PERFECT = {"minimax", "cached", "optimal"}
+
+# Moves chosen by minimax, and values of boards when both players follow
+# minimax from them, already computed in this process
+cache = dict()
+values = dict()
+
+
+def random_move(board, rng, stats, options):
+    """
+    Returns a uniformly random legal move.
+    """
+    return rng.choice(sorted(ttt.actions(board)))
+
+
+def minimax_move(board, rng, stats, options):
+    """
+    Returns the move chosen by plain minimax.
+    """
+    return ttt.minimax(board, stats)
+
+
+def cached_move(board, rng, stats, options):
+    """
+    Returns the minimax move, searching each position only once per process.
+    """
+    key = tuple(map(tuple, board))
+    if key not in cache:
+        cache[key] = ttt.minimax(board, stats)
+    return cache[key]
+
+
+def value(board, stats):
+    """
+    Returns the utility of the board when both players follow minimax.
+    """
+    key = tuple(map(tuple, board))
+    if key not in values:
+        if ttt.terminal(board):
+            values[key] = ttt.utility(board)
+        else:
+            move = cached_move(board, None, stats, None)
+            values[key] = value(ttt.result(board, move), stats)
+    return values[key]
+
+
+def optimal_move(board, rng, stats, options):
+    """
+    Returns a random move among those as good as the minimax move, each
+    judged by the value of minimax play after it, so that games between
+    perfect players vary.
+    """
+    scores = {
+        action: value(ttt.result(board, action), stats)
+        for action in ttt.actions(board)
+    }
+    best = (max if ttt.player(board) == ttt.X else min)(scores.values())
+    return rng.choice(sorted(action for action in scores
+                             if scores[action] == best))
+
+
+def mcts_move(board, rng, stats, options):
+    """
+    Returns the move chosen by Monte Carlo Tree Search.
+    """
+    return mcts.mcts(board, iterations=options["iterations"],
+                     seed=rng.randrange(2 ** 32), stats=stats)
+
+
+ENGINES = {
+    "random": random_move,
+    "minimax": minimax_move,
+    "cached": cached_move,
+    "optimal": optimal_move,
+    "mcts": mcts_move,
+}
+
+
+def play_game(task):
+    """
+    Plays one game and returns its winner, per-move measurements and
+    the actions played.
+    """
+    engines, seed, options = task
+    rng = random.Random(seed)
+    board = ttt.initial_state()
+    moves = []
+    actions = []
+    while not ttt.terminal(board):
+        player = ttt.player(board)
+        name = engines[player]
+        stats = {"nodes": 0}
+        start = time.perf_counter()
+        action = ENGINES[name](board, rng, stats, options)
+        latency = time.perf_counter() - start
+        board = ttt.result(board, action)
+        moves.append((player, latency, stats["nodes"]))
+        actions.append(action)
+    return ttt.winner(board), moves, tuple(actions)
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of values by the nearest-rank method.
+    """
+    values = sorted(values)
+    if not values:
+        return 0
+    rank = max(1, -(-q * len(values) // 100))
+    return values[int(rank) - 1]
+
+
+def tournament(x, o, games, processes=None, seed=0, iterations=500):
+    """
+    Plays `games` games between engines `x` and `o` across a process pool.
+    Returns the winners of every game, the moves of each player, the
+    number of distinct games played and the elapsed wall-clock time.
+    """
+    engines = {ttt.X: x, ttt.O: o}
+    options = {"iterations": iterations}
+    tasks = [(engines, seed + game, options) for game in range(games)]
+    processes = processes or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = list(pool.imap_unordered(
+            play_game, tasks, chunksize=max(1, games // (processes * 8))
+        ))
+    elapsed = time.perf_counter() - start
+
+    winners = [winner for winner, _, _ in results]
+    moves = {ttt.X: [], ttt.O: []}
+    for _, game_moves, _ in results:
+        for player, latency, nodes in game_moves:
+            moves[player].append((latency, nodes))
+    distinct = len({actions for _, _, actions in results})
+    return winners, moves, distinct, elapsed
+
+
+def verify(x, o, winners):
+    """
+    Returns a list of problems found in the results: perfect engines
+    must never lose, and two perfect engines must always draw.
+    """
+    problems = []
+    if x in PERFECT and o in PERFECT and any(winners):
+        problems.append("perfect play did not always draw")
+    if x in PERFECT and ttt.O in winners:
+        problems.append(f"perfect engine {x} lost as X")
+    if o in PERFECT and ttt.X in winners:
+        problems.append(f"perfect engine {o} lost as O")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--x", choices=ENGINES, default="optimal")
+    parser.add_argument("--o", choices=ENGINES, default="optimal")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=500,
+                        help="MCTS iterations per move")
+    args = parser.parse_args()
+
+    winners, moves, distinct, elapsed = tournament(
+        args.x, args.o, args.games, args.processes, args.seed, args.iterations
+    )
+
+    print(f"{args.x} (X) vs {args.o} (O): {args.games} games "
+          f"in {elapsed:.2f}s ({args.games / elapsed:,.1f} games/sec)")
+    print(f"  X wins: {winners.count(ttt.X)}")
+    print(f"  O wins: {winners.count(ttt.O)}")
+    print(f"  Draws: {winners.count(None)}")
+    print(f"  Distinct games: {distinct}")
+    for player, name in ((ttt.X, args.x), (ttt.O, args.o)):
+        latencies = [latency * 1000 for latency, _ in moves[player]]
+        nodes = [count for _, count in moves[player]]
+        print(f"  {player} ({name}): {len(nodes)} moves, "
+              f"{sum(nodes) / max(1, len(nodes)):,.1f} nodes/move")
+        print(f"    latency ms: p50 {percentile(latencies, 50):.3f}, "
+              f"p90 {percentile(latencies, 90):.3f}, "
+              f"p99 {percentile(latencies, 99):.3f}, "
+              f"max {max(latencies, default=0):.3f}")
+
+    problems = verify(args.x, args.o, winners)
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()